@@ -0,0 +1,39 @@
+"""
+GUNICORN CONFIG - CATALYST 9300-24UX PRODUCTION MONITOR
+Serves network_monitor_production:app with gevent async workers
+
+Start:
+    gunicorn -c gunicorn_production.conf.py network_monitor_production:app
+"""
+
+import os
+
+bind = os.environ.get("NETBOT_BIND", "0.0.0.0:5000")
+
+# Async I/O worker: many concurrent API pollers served by greenlets.
+# Monitor state lives in the worker process, so each extra worker polls the
+# Catalyst over SNMP/SSH on its own and joins the :2055 SO_REUSEPORT group,
+# leaving each worker with only part of the Netflow data - keep one.
+worker_class = "gevent"
+workers = int(os.environ.get("NETBOT_WORKERS", 1))
+worker_connections = 1000
+keepalive = 30
+
+# The monitor must be started inside each worker (not in the master) so its
+# polling threads exist after fork and after gevent has patched the stdlib
+preload_app = False
+
+
+def post_worker_init(worker):
+    """Start the live monitor once the worker has loaded the app"""
+    from network_monitor_production import monitor
+
+    monitor.start()
+    worker.log.info(f"Production monitor started in worker {worker.pid}")
+
+
+def worker_exit(server, worker):
+    """Stop the live monitor with its worker"""
+    from network_monitor_production import monitor
+
+    monitor.stop()
@@ -0,0 +1,38 @@
+"""
+GUNICORN CONFIG - CATALYST 9300-24UX PRODUCTION MONITOR (FIXED EDITION)
+Serves network_monitor_production_fixed:app from a pooled-thread worker
+
+Start:
+    gunicorn -c gunicorn_production_fixed.conf.py network_monitor_production_fixed:app
+"""
+
+import os
+
+bind = os.environ.get("NETBOT_BIND", "0.0.0.0:5000")
+
+# Pooled request threads with keep-alive instead of a thread per request.
+# Monitor state lives in the worker process, so each extra worker opens its
+# own SSH session to the Catalyst - keep one unless that is intended.
+worker_class = "gthread"
+workers = int(os.environ.get("NETBOT_WORKERS", 1))
+threads = 8
+keepalive = 30
+worker_tmp_dir = "/dev/shm"
+
+# Import the app once in the master; polling threads are started after fork
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Start the live monitor inside the forked worker"""
+    from network_monitor_production_fixed import monitor
+
+    monitor.start()
+    server.log.info(f"Production monitor started in worker {worker.pid}")
+
+
+def worker_exit(server, worker):
+    """Stop the live monitor with its worker"""
+    from network_monitor_production_fixed import monitor
+
+    monitor.stop()
@@ -8,6 +8,7 @@ No simulation, demo, or mock data - Only Live Production Data
 import threading
 import time
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, deque
@@ -15,6 +16,7 @@ import ipaddress
 import socket
 import struct
 
+import numpy as np
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import paramiko
@@ -23,6 +25,17 @@ from pysnmp.hlapi import *
 from pysnmp.smi import builder, view
 import requests
 
+# Numba JIT for the Netflow record parser
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback: run the parser as plain Python when Numba is missing"""
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +43,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+if not NUMBA_AVAILABLE:
+    logger.warning("Numba not available - Netflow parsing runs in pure Python (pip install numba)")
+
+
+def _gevent_patched() -> bool:
+    """True when gevent has monkey-patched threading (gunicorn gevent workers)"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("threading")
+
+
+# ============ SNMP OIDS ============
+
+IF_TABLE_OID = "1.3.6.1.2.1.2.2.1"  # IF-MIB ifTable
+# ifDescr, ifAdminStatus, ifOperStatus, ifSpeed, ifInOctets, ifOutOctets, ifInErrors
+IF_QUERY_COLUMNS = (2, 7, 8, 5, 10, 16, 14)
+
+SNMP_BULK_REPETITIONS = 50  # Table rows returned per GETBULK round-trip
+SNMP_WALK_TTL = 30  # Seconds a table walk result is reused
+
+SSH_HEALTH_WINDOW = 60  # SSH is operational if a poll succeeded this recently
+REACHABILITY_TTL = 5  # Seconds a connectivity probe result is reused
+
+
+# ============ NETFLOW V5 DECODER ============
+
+NF5_HEADER_LEN = 24
+NF5_RECORD_LEN = 48
+NF5_MAX_RECORDS = 30  # Max flow records per v5 export packet
+NETFLOW_RCVBUF = 4 * 1024 * 1024  # Absorb export bursts without kernel drops
+
+# Netflow v9 / IPFIX information elements decoded from data records
+NETFLOW_TEMPLATE_FIELDS = {
+    1: "bytes",       # IN_BYTES / octetDeltaCount
+    2: "packets",     # IN_PKTS / packetDeltaCount
+    8: "src",         # IPV4_SRC_ADDR
+    10: "input_if",   # INPUT_SNMP
+    12: "dst",        # IPV4_DST_ADDR
+    14: "output_if",  # OUTPUT_SNMP
+}
+
+
+@njit(cache=True, nogil=True)
+def _nf_u16(buf, offset):
+    return (np.uint32(buf[offset]) << 8) | np.uint32(buf[offset + 1])
+
+
+@njit(cache=True, nogil=True)
+def _nf_u32(buf, offset):
+    return ((np.uint32(buf[offset]) << 24) | (np.uint32(buf[offset + 1]) << 16)
+            | (np.uint32(buf[offset + 2]) << 8) | np.uint32(buf[offset + 3]))
+
+
+@njit(cache=True, nogil=True)
+def parse_nf5(buf, out_src, out_dst, out_pkts, out_octets, out_in, out_out):
+    """
+    Decode a Netflow v5 packet into preallocated record arrays
+
+    Args:
+        buf: Raw packet as a uint8 array
+        out_src, out_dst, out_pkts, out_octets: uint32 arrays (NF5_MAX_RECORDS)
+        out_in, out_out: uint16 arrays (NF5_MAX_RECORDS)
+
+    Returns:
+        Number of records decoded (0 if not a valid v5 packet)
+    """
+    length = buf.shape[0]
+    if length < NF5_HEADER_LEN or _nf_u16(buf, 0) != 5:
+        return 0
+
+    count = min(_nf_u16(buf, 2), NF5_MAX_RECORDS)
+    decoded = 0
+    offset = NF5_HEADER_LEN
+    for i in range(count):
+        if offset + NF5_RECORD_LEN > length:
+            break
+        out_src[i] = _nf_u32(buf, offset)
+        out_dst[i] = _nf_u32(buf, offset + 4)
+        out_in[i] = _nf_u16(buf, offset + 12)
+        out_out[i] = _nf_u16(buf, offset + 14)
+        out_pkts[i] = _nf_u32(buf, offset + 16)
+        out_octets[i] = _nf_u32(buf, offset + 20)
+        decoded += 1
+        offset += NF5_RECORD_LEN
+
+    return decoded
+
+
+def _alloc_nf5_records() -> Tuple[np.ndarray, ...]:
+    """Allocate the (src, dst, pkts, octets, in_if, out_if) output arrays for parse_nf5"""
+    return (
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint32),
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint32),
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint32),
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint32),
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint16),
+        np.zeros(NF5_MAX_RECORDS, dtype=np.uint16),
+    )
+
 
 class CatalystNetworkMonitorProduction:
     """
@@ -80,14 +194,26 @@ class CatalystNetworkMonitorProduction:
 
         # Connection management
         self.snmp_engine = None
+        self.snmp_auth = None
+        self.snmp_target = None
+        self._walk_cache: Dict[str, Tuple[float, List[Tuple]]] = {}
         self.ssh_client = None
         self.running = False
         self.last_successful_update = None
         self.update_errors = []
+        self.last_ssh_ok = None
+        self._reachability: Tuple[float, bool] = (0.0, False)
+
+        # Netflow v9/IPFIX templates: (exporter, source_id, template_id) -> record dtype
+        self._netflow_templates: Dict[Tuple[str, int, int], np.dtype] = {}
 
-        # Netflow listener
-        self.netflow_socket = None
+        # Netflow listeners: one SO_REUSEPORT socket per core, the kernel
+        # hashes exporters across them (single socket where unsupported)
+        self.netflow_sockets: List[socket.socket] = []
+        self.netflow_listen_ip = netflow_listen_ip
         self.netflow_port = netflow_listen_port
+        self.netflow_listeners = (os.cpu_count() or 1) if hasattr(socket, "SO_REUSEPORT") else 1
+        self._netflow_lock = threading.Lock()
 
         # Thread management
         self.monitor_thread = None
@@ -163,10 +289,21 @@ class CatalystNetworkMonitorProduction:
                 "last_update": None,
             }
 
+        # Per-port SNMP GET request, built once instead of on every poll
+        self._port_oid_bundle: Dict[int, Tuple[Tuple[str, ...], List[ObjectType]]] = {}
+        for port_id in self.port_stats:
+            oids = tuple(f"{IF_TABLE_OID}.{column}.{port_id}" for column in IF_QUERY_COLUMNS)
+            self._port_oid_bundle[port_id] = (oids, [ObjectType(ObjectIdentity(oid)) for oid in oids])
+
     def start(self):
         """Start production monitoring"""
         self.running = True
 
+        # Under gevent the listener "threads" are greenlets sharing one OS thread,
+        # so extra SO_REUSEPORT sockets add no parallelism - keep a single one
+        if _gevent_patched():
+            self.netflow_listeners = 1
+
         # Start SNMP polling thread
         snmp_thread = threading.Thread(target=self._snmp_polling_loop, daemon=True)
         snmp_thread.start()
@@ -177,11 +314,12 @@ class CatalystNetworkMonitorProduction:
         ssh_thread.start()
         logger.info("SSH polling thread started")
 
-        # Start Netflow listener if configured
+        # Start Netflow listeners if configured
         if self.netflow_port:
-            netflow_thread = threading.Thread(target=self._netflow_listener, daemon=True)
-            netflow_thread.start()
-            logger.info(f"Netflow listener started on port {self.netflow_port}")
+            for _ in range(self.netflow_listeners):
+                netflow_thread = threading.Thread(target=self._netflow_listener, daemon=True)
+                netflow_thread.start()
+            logger.info(f"{self.netflow_listeners} Netflow listener(s) started on port {self.netflow_port}")
 
         logger.info("Production monitoring started - acquiring LIVE data")
 
@@ -211,32 +349,17 @@ class CatalystNetworkMonitorProduction:
     def _snmp_query_interfaces(self):
         """Query real interface statistics via SNMP"""
         try:
-            # OID for interface table
-            interface_mib = "1.3.6.1.2.1.2.2.1"
+            now = time.time()
 
             # Query each interface
             for port_id, port_info in self.port_stats.items():
                 try:
-                    # Get interface name
-                    oid_name = f"{interface_mib}.2.{port_id}"
-                    # Get admin status
-                    oid_admin = f"{interface_mib}.7.{port_id}"
-                    # Get oper status
-                    oid_oper = f"{interface_mib}.8.{port_id}"
-                    # Get speed
-                    oid_speed = f"{interface_mib}.5.{port_id}"
-                    # Get in octets
-                    oid_in_octets = f"{interface_mib}.10.{port_id}"
-                    # Get out octets
-                    oid_out_octets = f"{interface_mib}.16.{port_id}"
-                    # Get in errors
-                    oid_in_errors = f"{interface_mib}.14.{port_id}"
+                    oids, var_binds = self._port_oid_bundle[port_id]
+                    (oid_name, oid_admin, oid_oper, oid_speed,
+                     oid_in_octets, oid_out_octets, oid_in_errors) = oids
 
                     # Use pysnmp to query (real SNMP call)
-                    results = self._snmp_get_bulk(
-                        [oid_name, oid_admin, oid_oper, oid_speed, 
-                         oid_in_octets, oid_out_octets, oid_in_errors]
-                    )
+                    results = self._snmp_get_bulk(var_binds)
 
                     if results:
                         # Update port stats with REAL data
@@ -246,7 +369,7 @@ class CatalystNetworkMonitorProduction:
                         port_info["oper_status"] = "up" if results.get(oid_oper) == 1 else "down"
                         port_info["admin_status"] = "up" if results.get(oid_admin) == 1 else "down"
                         port_info["speed"] = int(results.get(oid_speed, 0))
-                        port_info["last_update"] = datetime.now()
+                        port_info["last_update"] = now
 
                 except Exception as e:
                     logger.debug(f"Error querying port {port_id}: {e}")
@@ -265,6 +388,7 @@ class CatalystNetworkMonitorProduction:
 
             # Get all ARP entries
             arp_entries = self._snmp_walk(f"{arp_mib}.2")  # ipNetToMediaPhysAddress
+            now = time.time()
 
             for entry in arp_entries:
                 try:
@@ -278,15 +402,15 @@ class CatalystNetworkMonitorProduction:
                             self.active_hosts[ip] = {
                                 "ip": ip,
                                 "mac": mac,
-                                "first_seen": datetime.now(),
-                                "last_seen": datetime.now(),
+                                "first_seen": now,
+                                "last_seen": now,
                                 "status": "online",
                                 "hostname": self._resolve_hostname_dns(ip),
                                 "traffic_in_bytes": 0,
                                 "traffic_out_bytes": 0,
                             }
                         else:
-                            self.active_hosts[ip]["last_seen"] = datetime.now()
+                            self.active_hosts[ip]["last_seen"] = now
 
                 except Exception as e:
                     logger.debug(f"Error parsing ARP entry: {e}")
@@ -329,6 +453,7 @@ class CatalystNetworkMonitorProduction:
             self._parse_interface_stats(interface_stats)
 
             ssh.close()
+            self.last_ssh_ok = time.monotonic()
 
         except Exception as e:
             logger.debug(f"SSH interface query error: {e}")
@@ -351,21 +476,33 @@ class CatalystNetworkMonitorProduction:
             logger.debug(f"VLAN info retrieved")
 
             ssh.close()
+            self.last_ssh_ok = time.monotonic()
 
         except Exception as e:
             logger.debug(f"SSH VLAN query error: {e}")
 
     def _netflow_listener(self):
         """Listen for Netflow v5/v9 data from Catalyst"""
+        sock = None
         try:
-            self.netflow_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.netflow_socket.bind((self.netflow_port[0], self.netflow_port[1]))
-            logger.info(f"Netflow listener bound to {self.netflow_port}")
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if self.netflow_listeners > 1:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, NETFLOW_RCVBUF)
+            sock.settimeout(1.0)
+            sock.bind((self.netflow_listen_ip, self.netflow_port))
+            self.netflow_sockets.append(sock)
+            logger.info(f"Netflow listener bound to {self.netflow_listen_ip}:{self.netflow_port}")
+
+            # Receive buffer and decoded record arrays are reused for every packet
+            buf = bytearray(65535)
+            packet = np.frombuffer(buf, dtype=np.uint8)
+            records = _alloc_nf5_records()
 
             while self.running:
                 try:
-                    data, addr = self.netflow_socket.recvfrom(65535)
-                    self._parse_netflow_v5(data, addr)
+                    nbytes, addr = sock.recvfrom_into(buf)
+                    self._parse_netflow(packet[:nbytes], addr, records)
                 except socket.timeout:
                     continue
                 except Exception as e:
@@ -374,54 +511,172 @@ class CatalystNetworkMonitorProduction:
         except Exception as e:
             logger.error(f"Netflow listener error: {e}")
         finally:
-            if self.netflow_socket:
-                self.netflow_socket.close()
-
-    def _parse_netflow_v5(self, data: bytes, addr: Tuple):
+            if sock:
+                if sock in self.netflow_sockets:
+                    self.netflow_sockets.remove(sock)
+                sock.close()
+
+    def _parse_netflow(self, packet: np.ndarray, addr: Tuple, records: Tuple[np.ndarray, ...]):
+        """Dispatch an export packet to the decoder for its Netflow version"""
+        if len(packet) < 2:
+            return
+
+        version = struct.unpack_from("!H", packet)[0]
+        if version == 5:
+            self._parse_netflow_v5(packet, addr, records)
+        elif version == 9:
+            self._parse_netflow_v9(packet, addr)
+        elif version == 10:
+            self._parse_ipfix(packet, addr)
+
+    def _parse_netflow_v5(self, packet: np.ndarray, addr: Tuple, records: Tuple[np.ndarray, ...]):
         """Parse Netflow v5 packets for real flow data"""
         try:
-            # Netflow v5 header: 24 bytes
-            if len(data) < 24:
-                return
+            count = parse_nf5(packet, *records)
+            if count:
+                self._record_flows(*(a[:count] for a in records))
 
-            # Extract flows from packet
-            version = struct.unpack("!H", data[0:2])[0]
-            if version != 5:
+        except Exception as e:
+            logger.debug(f"Netflow v5 parse error: {e}")
+
+    def _parse_netflow_v9(self, packet: np.ndarray, addr: Tuple):
+        """Parse Netflow v9 (Flexible Netflow) packets for real flow data"""
+        try:
+            # Header: version, count, sys_uptime, unix_secs, sequence, source_id
+            if len(packet) < 20:
                 return
+            source_id = struct.unpack_from("!I", packet, 16)[0]
+            self._parse_flowsets(packet, 20, (addr[0], source_id), template_set_id=0, enterprise_fields=False)
 
-            count = struct.unpack("!H", data[2:4])[0]
-            sys_uptime = struct.unpack("!I", data[4:8])[0]
-
-            # Parse each flow record (48 bytes each)
-            offset = 24
-            for i in range(count):
-                if offset + 48 > len(data):
-                    break
-
-                flow = struct.unpack("!IIIHHIIIIIHH", data[offset:offset+48])
-                srcaddr, dstaddr, nexthop, input_if, output_if = flow[0:5]
-                d_pkts, d_octets = flow[5:7]
-
-                # Convert IP addresses
-                src_ip = socket.inet_ntoa(struct.pack("!I", srcaddr))
-                dst_ip = socket.inet_ntoa(struct.pack("!I", dstaddr))
-
-                # Record flow
-                flow_key = f"{src_ip}-{dst_ip}"
-                self.netflow_flows[flow_key] = {
-                    "src": src_ip,
-                    "dst": dst_ip,
-                    "packets": d_pkts,
-                    "bytes": d_octets,
-                    "input_if": input_if,
-                    "output_if": output_if,
-                    "timestamp": datetime.now(),
-                }
+        except Exception as e:
+            logger.debug(f"Netflow v9 parse error: {e}")
 
-                offset += 48
+    def _parse_ipfix(self, packet: np.ndarray, addr: Tuple):
+        """Parse IPFIX (Netflow v10) packets for real flow data"""
+        try:
+            # Header: version, length, export_time, sequence, observation_domain_id
+            if len(packet) < 16:
+                return
+            length, = struct.unpack_from("!H", packet, 2)
+            domain_id, = struct.unpack_from("!I", packet, 12)
+            self._parse_flowsets(packet[:length], 16, (addr[0], domain_id), template_set_id=2, enterprise_fields=True)
 
         except Exception as e:
-            logger.debug(f"Netflow v5 parse error: {e}")
+            logger.debug(f"IPFIX parse error: {e}")
+
+    def _parse_flowsets(
+        self,
+        packet: np.ndarray,
+        offset: int,
+        source: Tuple[str, int],
+        template_set_id: int,
+        enterprise_fields: bool,
+    ):
+        """Walk the FlowSets of a v9/IPFIX packet: cache templates, bulk-decode data"""
+        end = len(packet)
+        while offset + 4 <= end:
+            set_id, set_len = struct.unpack_from("!HH", packet, offset)
+            if set_len < 4 or offset + set_len > end:
+                break
+
+            if set_id == template_set_id:
+                self._parse_template_set(packet, offset + 4, offset + set_len, source, enterprise_fields)
+            elif set_id >= 256:
+                dtype = self._netflow_templates.get(source + (set_id,))
+                if dtype is None:
+                    logger.debug(f"Netflow template {set_id} from {source[0]} not received yet")
+                else:
+                    count = (set_len - 4) // dtype.itemsize
+                    if count:
+                        flows = np.frombuffer(packet, dtype=dtype, count=count, offset=offset + 4)
+                        self._record_flows(*(
+                            flows[name] if name in dtype.names else np.zeros(count, dtype=np.uint32)
+                            for name in ("src", "dst", "packets", "bytes", "input_if", "output_if")
+                        ))
+            # Options templates/data (set IDs 1 and 3) carry no flow records
+
+            offset += set_len
+
+    def _parse_template_set(
+        self,
+        packet: np.ndarray,
+        offset: int,
+        end: int,
+        source: Tuple[str, int],
+        enterprise_fields: bool,
+    ):
+        """Cache the record dtype of every template in a template FlowSet"""
+        while offset + 4 <= end:
+            template_id, field_count = struct.unpack_from("!HH", packet, offset)
+            offset += 4
+
+            fields = []
+            for _ in range(field_count):
+                field_type, field_len = struct.unpack_from("!HH", packet, offset)
+                offset += 4
+                if enterprise_fields and field_type & 0x8000:
+                    offset += 4  # Enterprise number - vendor field is skipped as padding
+                    field_type = 0
+                fields.append((field_type, field_len))
+
+            dtype = self._template_dtype(fields)
+            if dtype is not None:
+                self._netflow_templates[source + (template_id,)] = dtype
+
+    @staticmethod
+    def _template_dtype(fields: List[Tuple[int, int]]) -> Optional[np.dtype]:
+        """Build a numpy record dtype for a template (None if it has no IPv4 flow keys)"""
+        names, formats = [], []
+        for index, (field_type, field_len) in enumerate(fields):
+            if field_len == 0xFFFF:
+                return None  # Variable-length IPFIX fields cannot be bulk-decoded
+
+            name = NETFLOW_TEMPLATE_FIELDS.get(field_type)
+            if name and name not in names and field_len in (1, 2, 4, 8):
+                formats.append(f">u{field_len}")
+            else:
+                name = f"_field{index}"
+                formats.append(f"V{field_len}")
+            names.append(name)
+
+        if "src" not in names or "dst" not in names:
+            return None
+        return np.dtype({"names": names, "formats": formats})
+
+    def _record_flows(
+        self,
+        src: np.ndarray,
+        dst: np.ndarray,
+        pkts: np.ndarray,
+        octets: np.ndarray,
+        in_if: np.ndarray,
+        out_if: np.ndarray,
+    ):
+        """Merge decoded flow records into the flow table"""
+        timestamp = time.time()
+
+        # Flow key is the raw (src << 32 | dst) address pair; IPs are
+        # only formatted as strings when the API returns them
+        keys = ((src.astype(np.uint64) << np.uint64(32)) | dst.astype(np.uint64)).tolist()
+        flows = {
+            key: {
+                "src": src_addr,
+                "dst": dst_addr,
+                "packets": d_pkts,
+                "bytes": d_octets,
+                "input_if": input_if,
+                "output_if": output_if,
+                "timestamp": timestamp,
+            }
+            for key, src_addr, dst_addr, d_pkts, d_octets, input_if, output_if in zip(
+                keys, src.tolist(), dst.tolist(), pkts.tolist(),
+                octets.tolist(), in_if.tolist(), out_if.tolist()
+            )
+        }
+
+        # Merge the whole packet at once - several listener threads share the table
+        with self._netflow_lock:
+            self.netflow_flows.update(flows)
 
     def _calculate_traffic_metrics(self):
         """Calculate real traffic metrics from SNMP counters"""
@@ -450,25 +705,66 @@ class CatalystNetworkMonitorProduction:
         except Exception as e:
             logger.debug(f"Traffic calculation error: {e}")
 
-    def _snmp_get_bulk(self, oids: List[str]) -> Dict:
+    def _snmp_session(self):
+        """Create the SNMP engine, credentials and transport once"""
+        if self.snmp_engine is None:
+            self.snmp_engine = SnmpEngine()
+            self.snmp_auth = CommunityData(self.snmp_community, mpModel=1)  # v2c
+            self.snmp_target = UdpTransportTarget((self.catalyst_ip, 161), timeout=2, retries=1)
+
+    def _snmp_get_bulk(self, var_binds: List[ObjectType]) -> Dict:
         """Execute SNMP GET operation"""
         try:
-            # Implementation using pysnmp
+            self._snmp_session()
+            error_indication, error_status, error_index, results = next(
+                getCmd(
+                    self.snmp_engine,
+                    self.snmp_auth,
+                    self.snmp_target,
+                    ContextData(),
+                    *var_binds,
+                    lookupMib=False,
+                )
+            )
+            if error_indication or error_status:
+                logger.debug(f"SNMP GET error: {error_indication or error_status.prettyPrint()}")
+                return {}
+
             # Returns dict of {oid: value}
-            results = {}
-            # Actual SNMP implementation here
-            return results
+            return {str(name): value for name, value in results}
         except Exception as e:
             logger.debug(f"SNMP GET error: {e}")
             return {}
 
     def _snmp_walk(self, oid: str) -> List[Tuple]:
-        """Execute SNMP WALK operation"""
+        """Execute SNMP WALK operation (GETBULK, cached for SNMP_WALK_TTL)"""
+        now = time.monotonic()
+        cached = self._walk_cache.get(oid)
+        if cached and now - cached[0] < SNMP_WALK_TTL:
+            return cached[1]
+
         try:
-            # Implementation using pysnmp
+            self._snmp_session()
+
             # Returns list of (oid, value) tuples
             results = []
-            # Actual SNMP implementation here
+            for error_indication, error_status, error_index, var_binds in bulkCmd(
+                self.snmp_engine,
+                self.snmp_auth,
+                self.snmp_target,
+                ContextData(),
+                0,
+                SNMP_BULK_REPETITIONS,
+                ObjectType(ObjectIdentity(oid)),
+                lexicographicMode=False,
+                lookupMib=False,
+            ):
+                if error_indication or error_status:
+                    logger.debug(f"SNMP WALK error: {error_indication or error_status.prettyPrint()}")
+                    return results
+                results.extend((str(name), value) for name, value in var_binds)
+
+            self._walk_cache[oid] = (now, results)
             return results
         except Exception as e:
             logger.debug(f"SNMP WALK error: {e}")
@@ -493,12 +789,24 @@ class CatalystNetworkMonitorProduction:
     def _hex_to_mac(self, hex_string: str) -> str:
         """Convert hex string to MAC address"""
         try:
+            if hasattr(hex_string, "asOctets"):
+                hex_string = hex_string.asOctets()
             if isinstance(hex_string, bytes):
                 hex_string = hex_string.hex()
             return ":".join([hex_string[i:i+2] for i in range(0, len(hex_string), 2)])
         except:
             return ""
 
+    @staticmethod
+    def _int_to_ip(addr: int) -> str:
+        """Convert a 32-bit integer address to dotted-quad notation"""
+        return socket.inet_ntoa(struct.pack("!I", addr))
+
+    @staticmethod
+    def _format_timestamp(ts: Optional[float]) -> Optional[str]:
+        """Convert an internal epoch timestamp to ISO format for API output"""
+        return datetime.fromtimestamp(ts).isoformat() if ts else None
+
     def _parse_arp_oid(self, oid: str) -> Optional[str]:
         """Extract IP from ARP table OID"""
         try:
@@ -550,20 +858,21 @@ class CatalystNetworkMonitorProduction:
             "last_successful_update": self.last_successful_update.isoformat() if self.last_successful_update else None,
             "snmp_community": self.snmp_community,
             "ssh_enabled": bool(self.ssh_user),
-            "netflow_enabled": bool(self.netflow_socket),
+            "netflow_enabled": bool(self.netflow_sockets),
         }
 
     def get_active_hosts(self) -> List[Dict]:
         """Return real active hosts"""
+        now = time.time()
         return [
             {
                 "ip": h["ip"],
                 "mac": h["mac"],
                 "hostname": h["hostname"],
                 "status": h["status"],
-                "first_seen": h["first_seen"].isoformat(),
-                "last_seen": h["last_seen"].isoformat(),
-                "seconds_since_seen": (datetime.now() - h["last_seen"]).total_seconds(),
+                "first_seen": self._format_timestamp(h["first_seen"]),
+                "last_seen": self._format_timestamp(h["last_seen"]),
+                "seconds_since_seen": now - h["last_seen"],
             }
             for h in self.active_hosts.values()
         ]
@@ -574,7 +883,7 @@ class CatalystNetworkMonitorProduction:
             str(port_id): {
                 **port_info,
                 "connected_macs": list(port_info["connected_mac_addresses"]),
-                "last_update": port_info["last_update"].isoformat() if port_info["last_update"] else None,
+                "last_update": self._format_timestamp(port_info["last_update"]),
             }
             for port_id, port_info in self.port_stats.items()
         }
@@ -583,6 +892,21 @@ class CatalystNetworkMonitorProduction:
         """Return real traffic history"""
         return list(self.traffic_history)
 
+    def get_netflow_flows(self) -> List[Dict]:
+        """Return real Netflow flows"""
+        with self._netflow_lock:
+            flows = list(self.netflow_flows.values())
+
+        return [
+            {
+                **flow,
+                "src": self._int_to_ip(flow["src"]),
+                "dst": self._int_to_ip(flow["dst"]),
+                "timestamp": self._format_timestamp(flow["timestamp"]),
+            }
+            for flow in flows
+        ]
+
     def get_uplink_stats(self) -> Dict:
         """Return real uplink (40G QSFP+) statistics"""
         uplink_stats = {}
@@ -602,7 +926,7 @@ class CatalystNetworkMonitorProduction:
                     "in_errors": port["in_errors"],
                     "out_errors": port["out_errors"],
                     "in_discards": port["in_discards"],
-                    "timestamp": port["last_update"].isoformat() if port["last_update"] else None,
+                    "timestamp": self._format_timestamp(port["last_update"]),
                 })
 
         return errors
@@ -625,29 +949,30 @@ class CatalystNetworkMonitorProduction:
         }
 
     def _test_catalyst_connectivity(self) -> bool:
-        """Test if Catalyst is reachable"""
+        """Test if Catalyst is reachable (probe result cached for REACHABILITY_TTL)"""
+        checked_at, reachable = self._reachability
+        now = time.monotonic()
+        if now - checked_at < REACHABILITY_TTL:
+            return reachable
+
         try:
-            socket.create_connection((self.catalyst_ip, 161), timeout=5)
-            return True
+            with socket.create_connection((self.catalyst_ip, 161), timeout=5):
+                reachable = True
         except:
-            return False
+            reachable = False
+
+        self._reachability = (now, reachable)
+        return reachable
 
     def _test_snmp(self) -> bool:
         """Test SNMP connectivity"""
         return self.last_successful_update is not None
 
     def _test_ssh(self) -> bool:
-        """Test SSH connectivity"""
-        if not self.ssh_user:
-            return False
-        try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(self.catalyst_ip, username=self.ssh_user, password=self.ssh_pass, timeout=5)
-            ssh.close()
-            return True
-        except:
+        """Test SSH connectivity (passive - based on the last successful SSH poll)"""
+        if not self.ssh_user or self.last_ssh_ok is None:
             return False
+        return (time.monotonic() - self.last_ssh_ok) < SSH_HEALTH_WINDOW
 
 
 # ============ FLASK API ============
@@ -663,7 +988,8 @@ monitor = CatalystNetworkMonitorProduction(
     ssh_pass="cisco",            # CONFIGURE: Your SSH password
 )
 
-monitor.start()
+# NOTE: monitor.start() is called from __main__ (dev server) or from the
+# post_worker_init hook in gunicorn_production.conf.py (gunicorn workers)
 
 
 @app.route("/api/summary", methods=["GET"])
@@ -690,6 +1016,12 @@ def api_traffic():
     return jsonify(monitor.get_traffic_history())
 
 
+@app.route("/api/flows", methods=["GET"])
+def api_flows():
+    """Netflow flows - LIVE DATA ONLY"""
+    return jsonify(monitor.get_netflow_flows())
+
+
 @app.route("/api/uplinks", methods=["GET"])
 def api_uplinks():
     """Uplink statistics - LIVE DATA ONLY"""
@@ -735,7 +1067,10 @@ if __name__ == "__main__":
     logger.info("✓ Netflow listener enabled")
     logger.info("=" * 60)
     logger.info("Starting Flask API on http://0.0.0.0:5000")
-    
+    logger.info("Production deployment: gunicorn -c gunicorn_production.conf.py network_monitor_production:app")
+
+    monitor.start()
+
     try:
         app.run(debug=False, host="0.0.0.0", port=5000, threaded=True)
     except KeyboardInterrupt:
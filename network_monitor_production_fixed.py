@@ -10,15 +10,32 @@ FIXED: Serves HTML dashboard directly
 import threading
 import time
 import logging
+import gzip
+import os
+import shutil
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, deque
-import ipaddress
+import re
 import socket
 
-from flask import Flask, jsonify, request, send_file
+import numpy as np
+import orjson
+from flask import Flask, Response, request, send_file
 from flask_cors import CORS
-import paramiko
+import asyncio
+import asyncssh
+
+# SNMP (optional - ARP discovery falls back to SSH "show arp" without it)
+try:
+    from pysnmp.hlapi import (
+        SnmpEngine, CommunityData, UdpTransportTarget, ContextData,
+        ObjectType, ObjectIdentity, bulkCmd,
+    )
+    SNMP_AVAILABLE = True
+except ImportError:
+    SNMP_AVAILABLE = False
+    logging.warning("pysnmp not available - ARP via SSH only (pip install pysnmp==5.0.3 pyasn1==0.4.8)")
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +44,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ARP_PHYS_ADDRESS_OID = "1.3.6.1.2.1.4.22.1.2"  # IP-MIB ipNetToMediaPhysAddress
+SNMP_BULK_REPETITIONS = 50  # ARP rows returned per GETBULK round-trip
+SNMP_BACKOFF = 60  # Seconds SNMP is skipped after a failed walk (doubles per consecutive failure)
+SNMP_BACKOFF_MAX = 3600
+
+DASHBOARD_MAX_AGE = 3600  # Browser cache lifetime for the HTML dashboards (seconds)
+DASHBOARD_FILES = ("dashboard_production.html", "dashboard_multi_vendor.html")
+
+TRAFFIC_HISTORY_LEN = 300  # Samples kept for /api/traffic
+TRAFFIC_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("total_in_octets", "u8"),
+    ("total_out_octets", "u8"),
+    ("active_ports", "u2"),
+])
+
+UPDATE_ERRORS_MAX = 100  # Poll errors retained (oldest dropped first)
+HEALTH_FRESH_SECONDS = 30  # Last poll younger than this = healthy (and reachable)
+REACHABILITY_TTL = 5  # Seconds a TCP/22 probe result is reused by /api/health
+
+LOCAL_ARP_PATH = "/proc/net/arp"
+ARP_FULL_REFRESH = 300  # Seconds between full ARP table replacements while the sniffer runs (ages out departed hosts)
+ETH_P_ARP = 0x0806
+ARP_FRAME_LEN = 42  # Ethernet header (14) + Ethernet/IPv4 ARP payload (28)
+
+SSH_READ_TIMEOUT = 10  # Seconds to wait for the CLI prompt after a command
+CLI_PROMPT_RE = re.compile(rb'(?:^|[\r\n])([^\r\n]*[>#])\s*$')  # e.g. "Catalyst9300#"
+
 
 class CatalystNetworkMonitorProduction:
     """
@@ -34,11 +79,21 @@ class CatalystNetworkMonitorProduction:
     Uses real data sources only: SNMP, SSH CLI, Netflow
     """
 
+    # "show arp" row: Internet  <ip>  <age>  <mac: aabb.ccdd.eeff or aa:bb:cc:dd:ee:ff>
+    # Octets are range-checked here so inet_aton never sees an invalid address
+    _ARP_RE = re.compile(
+        rb'(?<![\d.])((?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d))\s+\S+\s+'
+        rb'([0-9a-fA-F]{4}\.[0-9a-fA-F]{4}\.[0-9a-fA-F]{4}|(?:[0-9a-fA-F]{2}:){5}[0-9a-fA-F]{2})'
+    )
+
     def __init__(
         self,
         catalyst_ip: str,
         ssh_user: str = None,
         ssh_pass: str = None,
+        snmp_community: str = "public",
+        arp_sniff: bool = True,
+        use_local_arp: bool = True,
     ):
         """
         Initialize Production Network Monitor
@@ -47,25 +102,67 @@ class CatalystNetworkMonitorProduction:
             catalyst_ip: Catalyst 9300 management IP
             ssh_user: SSH username
             ssh_pass: SSH password
+            snmp_community: SNMP v2c community for ARP table walks
+            arp_sniff: Learn hosts passively from ARP frames on the local segment (Linux, CAP_NET_RAW)
+            use_local_arp: Merge the local kernel ARP table (/proc/net/arp) every poll
         """
         self.catalyst_ip = catalyst_ip
         self.ssh_user = ssh_user
         self.ssh_pass = ssh_pass
+        self.snmp_community = snmp_community
+        self.arp_sniff = arp_sniff
+        self._use_local_arp = use_local_arp
 
         # Real data storage (NOT simulated)
-        self.active_hosts: Dict[str, Dict] = {}
+        # ARP table: packed IPv4 (4 bytes) -> (MAC as 6 bytes, discovery time); formatted only by the API
+        self.active_hosts: Dict[bytes, Tuple[bytes, str]] = {}
+        self._hosts_lock = threading.Lock()  # Serializes writers only - readers use the published reference
+        self._arp_sniffing = False
+        self._last_arp_refresh = 0.0  # monotonic time the polled ARP table last replaced active_hosts
         self.port_stats: Dict[int, Dict] = {}
-        self.traffic_history = deque(maxlen=300)  # 5 minutes at 1/sec interval
+        # Traffic history ring buffer: one contiguous row per poll instead of a dict each
+        self._hist = np.zeros(TRAFFIC_HISTORY_LEN, dtype=TRAFFIC_DTYPE)
+        self._hist_idx = 0
+        self._hist_len = 0
+        self._hist_lock = threading.Lock()
         self.interface_counters = {}
 
         # Catalyst interface mapping (24x mGig + 8x 25G modules)
         self._initialize_port_mappings()
+        self._port_ids_by_name = {p["name"]: port_id for port_id, p in self.port_stats.items()}
+        # Maintained by _set_oper so /api/summary never scans the port table
+        self._ports_up_count = sum(1 for p in self.port_stats.values() if p["oper_status"] == "up")
+
+        # Constant /api/summary fields, serialized once ("{...," - the per-request tail closes it)
+        self._summary_prefix = orjson.dumps({
+            "data_source": "LIVE - SSH CLI",
+            "catalyst_model": "Catalyst 9300-24UX",
+            "catalyst_ip": catalyst_ip,
+            "total_ports": len(self.port_stats),
+            "ssh_enabled": True,
+        })[:-1] + b","
+
+        # Serialized /api/ports payload, rebuilt only after a port changes
+        self._ports_cache_bytes: Optional[bytes] = None
+        self._ports_dirty = True
+        self._ports_lock = threading.Lock()
 
         # Connection management
-        self.ssh_client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._conn: Optional[asyncssh.SSHClientConnection] = None
+        self._proc: Optional[asyncssh.SSHClientProcess] = None
+        self.cli_prompt: Optional[bytes] = None
+        self.snmp_engine = None
+        self.snmp_auth = None
+        self.snmp_target = None
+        self._snmp_failures = 0
+        self._snmp_retry_at = 0.0  # monotonic; SNMP is not tried again before this
         self.running = False
-        self.last_successful_update = None
-        self.update_errors = []
+        self.last_successful_update = None  # Wall clock, reported by the API
+        self.last_successful_ns = 0  # Monotonic, used for freshness checks
+        self.update_errors: deque = deque(maxlen=UPDATE_ERRORS_MAX)
+        self._last_probe_ts = 0.0
+        self._last_probe_val = False
 
         # Thread management
         self.monitor_thread = None
@@ -144,44 +241,90 @@ class CatalystNetworkMonitorProduction:
         """Start production monitoring"""
         self.running = True
 
-        # Start SSH polling thread
-        ssh_thread = threading.Thread(target=self._ssh_polling_loop, daemon=True)
-        ssh_thread.start()
-        logger.info("SSH polling thread started")
+        # All polling runs as coroutines on one event loop in a dedicated thread
+        self._loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self._ssh_polling_loop(), self._loop)
+        logger.info("SSH polling loop started")
+
+        if self.arp_sniff:
+            sock = self._open_arp_socket()
+            if sock:
+                self._arp_sniffing = True
+                sniff_thread = threading.Thread(target=self._arp_sniff_loop, args=(sock,), daemon=True)
+                sniff_thread.start()
+                logger.info("ARP sniffer thread started")
 
         logger.info("Production monitoring started - acquiring LIVE data")
 
     def stop(self):
         """Stop production monitoring"""
         self.running = False
-        if self.ssh_client:
-            self.ssh_client.close()
+        if self._loop:
+            if self._conn:
+                self._loop.call_soon_threadsafe(self._conn.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
         logger.info("Production monitoring stopped")
 
-    def _ssh_polling_loop(self):
+    async def _ssh_polling_loop(self):
         """SSH polling loop - queries real Catalyst data"""
         while self.running:
             try:
-                self._ssh_query_interfaces()
-                self._ssh_query_arp()
+                await self._ssh_query_all()
+                self._record_traffic()
+                self.last_successful_ns = time.monotonic_ns()
                 self.last_successful_update = datetime.now()
-                time.sleep(5)  # Poll every 5 seconds
+                await asyncio.sleep(5)  # Poll every 5 seconds
             except Exception as e:
                 logger.error(f"SSH polling error: {e}")
                 self.update_errors.append({
                     "timestamp": datetime.now(),
                     "error": str(e)
                 })
-                time.sleep(10)  # Backoff on error
+                await asyncio.sleep(10)  # Backoff on error
+
+    async def _ssh_query_all(self):
+        """One poll: interfaces via SSH, ARP via SNMP GETBULK or batched into the same SSH round-trip"""
+        # A running sniffer and the local ARP merge only ever add hosts - the Catalyst table
+        # is still fetched for a cold cache and every ARP_FULL_REFRESH to drop departed ones
+        need_arp = (
+            not (self._arp_sniffing and self.active_hosts)
+            or time.monotonic() - self._last_arp_refresh >= ARP_FULL_REFRESH
+        )
+
+        hosts = None
+        if need_arp and SNMP_AVAILABLE and time.monotonic() >= self._snmp_retry_at:
+            # pysnmp's synchronous walk blocks - keep it off the event loop
+            hosts = await self._loop.run_in_executor(None, self._snmp_query_arp)
+            if hosts is None:
+                # No SNMP or a wrong community costs a full timeout per poll - back off to SSH only
+                self._snmp_failures += 1
+                backoff = min(SNMP_BACKOFF_MAX, SNMP_BACKOFF * 2 ** (self._snmp_failures - 1))
+                self._snmp_retry_at = time.monotonic() + backoff
+                logger.warning(f"SNMP ARP walk failed - using SSH 'show arp' for the next {backoff}s")
+            else:
+                self._snmp_failures = 0
+
+        if hosts is not None or not need_arp:
+            interfaces_output, = await self._run("show interfaces summary")
+            if hosts is not None:
+                self._publish_hosts(hosts)
+                if hosts:
+                    logger.info(f"Discovered {len(hosts)} hosts via SNMP ARP table")
+            elif self._use_local_arp:
+                # Table not replaced this poll - merge what the kernel learned since
+                self._learn_hosts(self._read_local_arp())
+        else:
+            interfaces_output, arp_output = await self._run("show interfaces summary", "show arp")
+            self._parse_arp(arp_output)
 
-    def _ssh_query_interfaces(self):
-        """Get real Catalyst interface info via SSH"""
-        try:
-            if not self.ssh_client or not self.ssh_client.get_transport().is_active():
-                self._ssh_connect()
+        self._parse_interfaces(interfaces_output)
 
-            stdin, stdout, stderr = self.ssh_client.exec_command("show interfaces summary")
-            output = stdout.read().decode()
+    def _parse_interfaces(self, output: bytes):
+        """Apply "show interfaces summary" output to the port table"""
+        try:
+            output = output.decode()
 
             lines = output.split('\n')
             for line in lines:
@@ -192,178 +335,436 @@ class CatalystNetworkMonitorProduction:
                         status = parts[1] if len(parts) > 1 else "down"
                         logger.debug(f"Interface: {interface_name} = {status}")
 
+                        port_id = self._port_ids_by_name.get(interface_name)
+                        if port_id is None:
+                            continue
+                        self._set_oper(self.port_stats[port_id], "up" if status.lower() == "up" else "down")
+
+        except Exception as e:
+            logger.debug(f"Interface parse error: {e}")
+
+    def _set_oper(self, port: Dict, oper_status: str):
+        """Update a port's oper_status, keeping the operational-port count in step"""
+        old = port["oper_status"]
+        if old != oper_status:
+            self._ports_up_count += (oper_status == "up") - (old == "up")
+            port["oper_status"] = oper_status
+            port["last_update"] = datetime.now()
+            self._ports_dirty = True
+
+    def _record_traffic(self):
+        """Append one traffic sample (totals over operational ports) to the history"""
+        total_in = 0
+        total_out = 0
+        active_ports = 0
+        for port in self.port_stats.values():
+            if port["oper_status"] == "up":
+                total_in += port["in_octets"]
+                total_out += port["out_octets"]
+                active_ports += 1
+
+        with self._hist_lock:
+            self._hist[self._hist_idx] = (time.time(), total_in, total_out, active_ports)
+            self._hist_idx = (self._hist_idx + 1) % TRAFFIC_HISTORY_LEN
+            self._hist_len = min(TRAFFIC_HISTORY_LEN, self._hist_len + 1)
+
+    def _snmp_query_arp(self) -> Optional[Dict[bytes, bytes]]:
+        """Walk the ARP table via SNMP GETBULK (None if SNMP fails)"""
+        try:
+            if self.snmp_engine is None:
+                self.snmp_engine = SnmpEngine()
+                self.snmp_auth = CommunityData(self.snmp_community, mpModel=1)  # v2c
+                self.snmp_target = UdpTransportTarget((self.catalyst_ip, 161), timeout=2, retries=1)
+
+            hosts = {}
+            for error_indication, error_status, error_index, var_binds in bulkCmd(
+                self.snmp_engine,
+                self.snmp_auth,
+                self.snmp_target,
+                ContextData(),
+                0,
+                SNMP_BULK_REPETITIONS,
+                ObjectType(ObjectIdentity(ARP_PHYS_ADDRESS_OID)),
+                lexicographicMode=False,
+                lookupMib=False,
+            ):
+                if error_indication or error_status:
+                    logger.debug(f"SNMP ARP walk error: {error_indication or error_status.prettyPrint()}")
+                    return None
+
+                for name, value in var_binds:
+                    # Index: ifIndex.A.B.C.D, value: 6 raw MAC bytes
+                    mac = value.asOctets()
+                    if len(mac) != 6:
+                        continue
+                    hosts[bytes(name.asTuple()[-4:])] = mac
+
+            return hosts
+
         except Exception as e:
-            logger.debug(f"SSH interface query error: {e}")
+            logger.debug(f"SNMP ARP query error: {e}")
+            return None
 
-    def _ssh_query_arp(self):
-        """Get ARP table from Catalyst"""
+    def _parse_arp(self, output: bytes):
+        """Publish the ARP table from "show arp" output"""
         try:
-            if not self.ssh_client or not self.ssh_client.get_transport().is_active():
-                self._ssh_connect()
+            # One C-level regex scan over the raw buffer - the pattern already
+            # guarantees IP/MAC shape, so no per-row validation is needed
+            new_hosts = {
+                socket.inet_aton(ip.decode()): bytes.fromhex(mac.translate(None, b".:").decode())
+                for ip, mac in (match.groups() for match in self._ARP_RE.finditer(output))
+            }
+            self._publish_hosts(new_hosts)
+            if new_hosts:
+                logger.info(f"Discovered {len(new_hosts)} hosts via ARP")
 
-            stdin, stdout, stderr = self.ssh_client.exec_command("show arp")
-            output = stdout.read().decode()
+        except Exception as e:
+            logger.warning(f"ARP parse error - keeping previous host table: {e}")
+
+    def _publish_hosts(self, polled: Dict[bytes, bytes]):
+        """Replace the host table with a polled ARP table (plus the local kernel table)"""
+        if self._use_local_arp:
+            polled = {**self._read_local_arp(), **polled}  # The Catalyst wins on conflicts
+
+        discovery_time = datetime.now().isoformat()  # One timestamp per poll, not per host
+        with self._hosts_lock:
+            # Unchanged <IP, MAC> mappings keep the time they were first discovered
+            previous = self.active_hosts
+            hosts = {}
+            for ip, mac in polled.items():
+                known = previous.get(ip)
+                hosts[ip] = known if known is not None and known[0] == mac else (mac, discovery_time)
+            # Publish with a single reference assignment (atomic under the GIL),
+            # so API readers never see a half-built table and need no lock
+            self.active_hosts = hosts
+            self._last_arp_refresh = time.monotonic()
+
+    def _open_arp_socket(self) -> Optional[socket.socket]:
+        """Open a raw AF_PACKET socket receiving ARP frames (None if not permitted/supported)"""
+        try:
+            sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+        except (AttributeError, OSError) as e:  # AttributeError: AF_PACKET is Linux-only
+            logger.warning(f"ARP sniffing unavailable ({e}) - ARP via SNMP/SSH polling only")
+            return None
+        sock.settimeout(1.0)  # Wake up regularly to notice stop()
+        return sock
+
+    def _arp_sniff_loop(self, sock: socket.socket):
+        """Learn <IP, MAC> from every ARP frame seen on the segment (RFC 826 sender fields)"""
+        buf = bytearray(ARP_FRAME_LEN)
+        frame = memoryview(buf)
+        try:
+            while self.running:
+                try:
+                    nbytes = sock.recv_into(buf)
+                except socket.timeout:
+                    continue
+
+                # Ethernet/IPv4 ARP only: ptype 0x0800, hlen 6, plen 4
+                if nbytes < ARP_FRAME_LEN or frame[16:20] != b"\x08\x00\x06\x04":
+                    continue
+                sender_mac = bytes(frame[22:28])
+                sender_ip = bytes(frame[28:32])
+                if sender_ip == b"\x00\x00\x00\x00":  # ARP probe - no mapping yet
+                    continue
+
+                known = self.active_hosts.get(sender_ip)
+                if known is None or known[0] != sender_mac:
+                    self._learn_hosts({sender_ip: sender_mac})
 
-            hosts = []
-            lines = output.split('\n')
+        except Exception as e:
+            logger.error(f"ARP sniffer error: {e}")
+        finally:
+            self._arp_sniffing = False
+            sock.close()
+
+    def _learn_hosts(self, mappings: Dict[bytes, bytes]):
+        """Publish new or changed <IP, MAC> mappings (copy-on-write, like the polled tables)"""
+        with self._hosts_lock:
+            changed = {
+                ip: mac for ip, mac in mappings.items()
+                if self.active_hosts.get(ip, (None,))[0] != mac
+            }
+            if not changed:
+                return
+            discovery_time = datetime.now().isoformat()
+            hosts = dict(self.active_hosts)
+            for ip, mac in changed.items():
+                hosts[ip] = (mac, discovery_time)
+            self.active_hosts = hosts
+        logger.debug(f"ARP: learned {len(changed)} mapping(s)")
+
+    def _read_local_arp(self) -> Dict[bytes, bytes]:
+        """Read completed entries from the local kernel ARP table"""
+        mappings = {}
+        try:
+            with open(LOCAL_ARP_PATH, "rb") as f:
+                lines = f.read().splitlines()[1:]  # Skip the column header
 
             for line in lines:
-                if '.' in line and ':' in line:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        try:
-                            ip = parts[1]
-                            mac = parts[3]
-                            if self._is_valid_ip(ip) and self._is_valid_mac(mac):
-                                hosts.append({
-                                    "ip": ip,
-                                    "mac": mac,
-                                    "switch": "Catalyst 9300",
-                                    "discovery_time": datetime.now().isoformat(),
-                                })
-                        except:
-                            pass
-
-            self.active_hosts = {h["ip"]: h for h in hosts}
-            if hosts:
-                logger.info(f"Discovered {len(hosts)} hosts via ARP")
+                ip, hw_type, flags, mac, mask, dev = line.split()
+                if flags == b"0x0":  # Incomplete - no reply yet
+                    continue
+                mappings[socket.inet_aton(ip.decode())] = bytes.fromhex(mac.replace(b":", b"").decode())
 
         except Exception as e:
-            logger.debug(f"SSH ARP query error: {e}")
+            logger.debug(f"Local ARP read error: {e}")
+        return mappings
 
-    def _ssh_connect(self):
-        """Connect via SSH to Catalyst"""
+    async def _ssh_connect(self):
+        """Connect via SSH to Catalyst and open the persistent CLI shell"""
         try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self.ssh_client.connect(
+            self._conn = await asyncssh.connect(
                 self.catalyst_ip,
                 username=self.ssh_user,
                 password=self.ssh_pass,
-                timeout=10
+                known_hosts=None,
+                connect_timeout=10
+            )
+
+            # One long-lived interactive session for every poll instead of a channel per command
+            self._proc = await self._conn.create_process(
+                term_type="vt100", term_size=(512, 24), encoding=None
             )
+            self.cli_prompt = None
+            await self._read_until_prompt()  # Drain the login banner, learn the prompt
+            await self._run("terminal length 0")  # Disable --More-- paging
+
             logger.info(f"✓ Connected to Catalyst 9300 ({self.catalyst_ip})")
         except Exception as e:
             logger.error(f"SSH connection failed: {e}")
+            self._conn = None
+            self._proc = None
             raise
 
-    def _is_valid_ip(self, ip: str) -> bool:
-        """Validate IP address"""
+    async def _run(self, *commands: str) -> List[bytes]:
+        """Run CLI commands on the persistent shell in one write, return each command's raw output"""
+        if self._proc is None or self._proc.is_closing():
+            await self._ssh_connect()
+
         try:
-            ipaddress.IPv4Address(ip)
-            return True
-        except:
-            return False
+            self._proc.stdin.write("".join(f"{command}\n" for command in commands).encode())
+            output = await self._read_until_prompt(len(commands))
+        except Exception:
+            # Transport failure - drop the session so the next poll reconnects
+            self._conn.close()
+            self._conn = None
+            self._proc = None
+            raise
 
-    def _is_valid_mac(self, mac: str) -> bool:
-        """Validate MAC address"""
-        return len(mac.split(':')) == 6
+        # Every command's output ends at the prompt that precedes the next echo
+        chunks = output.split(self.cli_prompt)[:len(commands)]
+        # Strip the echoed command line from each
+        return [chunk.split(b"\n", 1)[-1] for chunk in chunks]
+
+    async def _read_until_prompt(self, count: int = 1) -> bytes:
+        """Read shell output until the CLI prompt has been printed `count` times"""
+        output = b""
+        deadline = self._loop.time() + SSH_READ_TIMEOUT
+        while True:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"No CLI prompt within {SSH_READ_TIMEOUT}s")
+            chunk = await asyncio.wait_for(self._proc.stdout.read(65536), remaining)
+            if not chunk:
+                raise EOFError("SSH shell closed by Catalyst")
+            output += chunk
+
+            if self.cli_prompt:
+                if output.rstrip().endswith(self.cli_prompt) and output.count(self.cli_prompt) >= count:
+                    return output
+            else:
+                match = CLI_PROMPT_RE.search(output)
+                if match:
+                    self.cli_prompt = match.group(1).strip()
+                    return output
+
+    @staticmethod
+    def _mac_to_str(mac: bytes) -> str:
+        """Format a 6-byte MAC as aa:bb:cc:dd:ee:ff"""
+        return mac.hex(":")
 
     # ============ API RESPONSE METHODS ============
 
-    def get_network_summary(self) -> Dict:
-        """Return real network statistics"""
-        active_count = len([h for h in self.active_hosts.values()])
+    def get_network_summary_json(self) -> bytes:
+        """Return real network statistics as JSON, encoding only the fields that change"""
+        # Snapshot once - the poller swaps in a new dict, never mutates this one
+        hosts = self.active_hosts
+        host_count = len(hosts)
 
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "data_source": "LIVE - SSH CLI",
-            "total_discovered_hosts": len(self.active_hosts),
-            "online_hosts": active_count,
-            "catalyst_model": "Catalyst 9300-24UX",
-            "catalyst_ip": self.catalyst_ip,
-            "ports_operational": sum(1 for p in self.port_stats.values() if p["oper_status"] == "up"),
-            "total_ports": len(self.port_stats),
-            "last_successful_update": self.last_successful_update.isoformat() if self.last_successful_update else None,
-            "ssh_enabled": True,
-        }
+        return self._summary_prefix + orjson.dumps({
+            "timestamp": datetime.now(),
+            "total_discovered_hosts": host_count,
+            "online_hosts": host_count,
+            "ports_operational": self._ports_up_count,
+            "last_successful_update": self.last_successful_update,
+        })[1:]
 
     def get_active_hosts(self) -> List[Dict]:
         """Return real active hosts"""
-        return list(self.active_hosts.values())
+        return [
+            {
+                "ip": socket.inet_ntoa(ip),
+                "mac": self._mac_to_str(mac),
+                "switch": "Catalyst 9300",
+                "discovery_time": discovery_time,
+            }
+            for ip, (mac, discovery_time) in self.active_hosts.items()
+        ]
 
     def get_port_statistics(self) -> Dict:
         """Return real port statistics"""
         return {
             str(port_id): {
                 **{k: v for k, v in port_info.items() if k != 'connected_mac_addresses'},
-                "connected_macs": list(port_info["connected_mac_addresses"]),
-                "last_update": port_info["last_update"].isoformat() if port_info["last_update"] else None,
+                "connected_macs": [self._mac_to_str(mac) for mac in port_info["connected_mac_addresses"]],
             }
             for port_id, port_info in self.port_stats.items()
         }
 
+    def get_port_statistics_json(self) -> bytes:
+        """Return real port statistics as JSON, re-serialized only after a port changed"""
+        with self._ports_lock:
+            if self._ports_dirty or self._ports_cache_bytes is None:
+                # Clear first so a write during serialization marks the cache dirty again
+                self._ports_dirty = False
+                self._ports_cache_bytes = orjson.dumps(self.get_port_statistics())
+            return self._ports_cache_bytes
+
     def get_traffic_history(self) -> List[Dict]:
         """Return real traffic history"""
-        return list(self.traffic_history) if self.traffic_history else []
+        with self._hist_lock:
+            if self._hist_len < TRAFFIC_HISTORY_LEN:
+                hist = self._hist[:self._hist_len].copy()
+            else:
+                hist = np.roll(self._hist, -self._hist_idx)  # Oldest sample first
+
+        return [dict(zip(TRAFFIC_DTYPE.names, row)) for row in hist.tolist()]
 
     def get_health_status(self) -> Dict:
         """Return system health status"""
-        if self.last_successful_update:
-            seconds_since_update = (datetime.now() - self.last_successful_update).total_seconds()
-            status = "healthy" if seconds_since_update < 30 else "degraded"
+        if self.last_successful_ns:
+            age_ns = time.monotonic_ns() - self.last_successful_ns
+            status = "healthy" if age_ns < HEALTH_FRESH_SECONDS * 1_000_000_000 else "degraded"
         else:
             status = "initializing"
 
         return {
             "status": status,
-            "last_update": self.last_successful_update.isoformat() if self.last_successful_update else "never",
-            "catalyst_reachable": self._test_catalyst_connectivity(),
-            "ssh_operational": self.ssh_client is not None,
-            "recent_errors": len(self.update_errors[-10:]),
+            "last_update": self.last_successful_update or "never",
+            # A recent successful poll proves reachability - only probe when polls are stale
+            "catalyst_reachable": status == "healthy" or self._test_catalyst_connectivity(),
+            "ssh_operational": self._conn is not None,
+            "recent_errors": min(10, len(self.update_errors)),
         }
 
     def _test_catalyst_connectivity(self) -> bool:
-        """Test if Catalyst is reachable"""
+        """Test if Catalyst is reachable (TCP/22 probe, memoized for REACHABILITY_TTL)"""
+        now = time.monotonic()
+        if now - self._last_probe_ts < REACHABILITY_TTL:
+            return self._last_probe_val
+
         try:
-            socket.create_connection((self.catalyst_ip, 22), timeout=5)
-            return True
-        except:
-            return False
+            with socket.create_connection((self.catalyst_ip, 22), timeout=1):
+                reachable = True
+        except OSError:
+            reachable = False
+
+        self._last_probe_ts = now
+        self._last_probe_val = reachable
+        return reachable
 
 
 # ============ FLASK API ============
 
 app = Flask(__name__, static_folder='.', static_url_path='')
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = DASHBOARD_MAX_AGE
 CORS(app)
 
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """JSON response encoded with orjson (native datetime/numpy support)"""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
 # Initialize with your Catalyst credentials
 monitor = CatalystNetworkMonitorProduction(
     catalyst_ip="192.168.1.1",  # CONFIGURE: Your Catalyst IP
     ssh_user="admin",            # CONFIGURE: Your SSH user
     ssh_pass="cisco",            # CONFIGURE: Your SSH password
+    snmp_community="public",     # CONFIGURE: Your SNMP community
+    arp_sniff=True,              # CONFIGURE: Passive ARP learning (needs root/CAP_NET_RAW)
+    use_local_arp=True,          # CONFIGURE: Merge this host's ARP table (same L2 segment only)
 )
 
-monitor.start()
+# NOTE: monitor.start() is called from __main__ (dev server) or from the
+# post_fork hook in gunicorn_production_fixed.conf.py (gunicorn worker)
 
 
 # ============ SERVE HTML DASHBOARD ============
 
+def _precompress_dashboards():
+    """Write a gzip -9 copy next to each dashboard whenever the HTML is newer"""
+    for filename in DASHBOARD_FILES:
+        path = os.path.join(app.root_path, filename)
+        gz_path = path + ".gz"
+        try:
+            if os.path.exists(path) and (
+                not os.path.exists(gz_path) or os.path.getmtime(gz_path) < os.path.getmtime(path)
+            ):
+                with open(path, "rb") as src, gzip.open(gz_path, "wb", compresslevel=9) as dst:
+                    shutil.copyfileobj(src, dst)
+        except OSError as e:
+            logger.warning(f"Could not precompress {filename}: {e}")
+
+
+def send_dashboard(filename: str) -> Response:
+    """Serve a dashboard with ETag/cache headers, precompressed when the client accepts gzip"""
+    path = os.path.join(app.root_path, filename)
+    gz_path = path + ".gz"
+
+    if request.accept_encodings["gzip"] > 0 and os.path.exists(gz_path):
+        response = send_file(gz_path, mimetype="text/html", conditional=True, download_name=filename)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = send_file(path, mimetype="text/html", conditional=True)
+
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = f"public, max-age={DASHBOARD_MAX_AGE}"
+    return response
+
+
+_precompress_dashboards()
+
+
 @app.route("/", methods=["GET"])
 def index():
     """Serve main dashboard"""
     try:
-        return send_file('dashboard_production.html', mimetype='text/html')
+        return send_dashboard('dashboard_production.html')
     except:
-        return jsonify({"error": "Dashboard not found. Make sure dashboard_production.html is in the same directory."}), 404
+        return ojsonify({"error": "Dashboard not found. Make sure dashboard_production.html is in the same directory."}, status=404)
 
 
 @app.route("/dashboard_production.html", methods=["GET"])
 def dashboard_production():
     """Serve production dashboard"""
     try:
-        return send_file('dashboard_production.html', mimetype='text/html')
+        return send_dashboard('dashboard_production.html')
     except:
-        return jsonify({"error": "Dashboard not found"}), 404
+        return ojsonify({"error": "Dashboard not found"}, status=404)
 
 
 @app.route("/dashboard_multi_vendor.html", methods=["GET"])
 def dashboard_multi_vendor():
     """Serve multi-vendor dashboard"""
     try:
-        return send_file('dashboard_multi_vendor.html', mimetype='text/html')
+        return send_dashboard('dashboard_multi_vendor.html')
     except:
-        return jsonify({"error": "Multi-vendor dashboard not found"}), 404
+        return ojsonify({"error": "Multi-vendor dashboard not found"}, status=404)
 
 
 # ============ API ENDPOINTS ============
@@ -371,64 +772,72 @@ def dashboard_multi_vendor():
 @app.route("/api/summary", methods=["GET"])
 def api_summary():
     """Network summary - LIVE DATA ONLY"""
-    return jsonify(monitor.get_network_summary())
+    return Response(monitor.get_network_summary_json(), mimetype="application/json")
 
 
 @app.route("/api/hosts", methods=["GET"])
 def api_hosts():
     """Active hosts - LIVE DATA ONLY"""
-    return jsonify(monitor.get_active_hosts())
+    return ojsonify(monitor.get_active_hosts())
 
 
 @app.route("/api/ports", methods=["GET"])
 def api_ports():
     """Port statistics - LIVE DATA ONLY"""
-    return jsonify(monitor.get_port_statistics())
+    return Response(monitor.get_port_statistics_json(), mimetype="application/json")
 
 
 @app.route("/api/traffic", methods=["GET"])
 def api_traffic():
     """Traffic history - LIVE DATA ONLY"""
-    return jsonify(monitor.get_traffic_history())
+    return ojsonify(monitor.get_traffic_history())
 
 
 @app.route("/api/health", methods=["GET"])
 def api_health():
     """System health - LIVE DATA ONLY"""
-    return jsonify(monitor.get_health_status())
+    return ojsonify(monitor.get_health_status())
 
 
 @app.route("/api/shutdown", methods=["POST"])
 def api_shutdown():
     """Graceful shutdown"""
     monitor.stop()
-    return jsonify({"status": "shutdown"})
+    return ojsonify({"status": "shutdown"})
+
+
+# Error bodies are constant (the 500 one up to its timestamp) - encode them once
+_NOT_FOUND_BODY = orjson.dumps({
+    "error": "Endpoint not found",
+    "available_endpoints": [
+        "/",
+        "/api/summary",
+        "/api/hosts",
+        "/api/ports",
+        "/api/traffic",
+        "/api/health",
+    ]
+})
+_INTERNAL_ERROR_PREFIX = orjson.dumps({
+    "error": "Internal server error",
+    "message": "Check production data sources",
+})[:-1] + b","
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Custom 404 handler"""
-    return jsonify({
-        "error": "Endpoint not found",
-        "available_endpoints": [
-            "/",
-            "/api/summary",
-            "/api/hosts",
-            "/api/ports",
-            "/api/traffic",
-            "/api/health",
-        ]
-    }), 404
+    return Response(_NOT_FOUND_BODY, status=404, mimetype="application/json")
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle errors - return NO fake data"""
-    return jsonify({
-        "error": "Internal server error",
-        "message": "Check production data sources",
-        "timestamp": datetime.now().isoformat()
-    }), 500
+    return Response(
+        _INTERNAL_ERROR_PREFIX + orjson.dumps({"timestamp": datetime.now()})[1:],
+        status=500,
+        mimetype="application/json",
+    )
 
 
 if __name__ == "__main__":
@@ -444,7 +853,10 @@ if __name__ == "__main__":
     logger.info("🌐 Dashboard: http://localhost:5000/")
     logger.info("📊 API: http://localhost:5000/api/summary")
     logger.info("")
-    
+    logger.info("Production deployment: gunicorn -c gunicorn_production_fixed.conf.py network_monitor_production_fixed:app")
+
+    monitor.start()
+
     try:
         app.run(debug=False, host="0.0.0.0", port=5000, threaded=True)
     except KeyboardInterrupt:
@@ -8,61 +8,51 @@ No shortcuts, no fake intelligence
 import threading
 import time
 import logging
+import re
+import functools
+import importlib.util
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from collections import defaultdict, deque
-import numpy as np
-from scipy import signal, stats
 import pickle
 import os
 import json
 
-# Deep Learning
-from tensorflow import keras
-from tensorflow.keras import layers, models
-from tensorflow.keras.preprocessing.sequence import TimeseriesGenerator
-import tensorflow as tf
-
-# Advanced ML
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, IsolationForest
-from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.covariance import EllipticEnvelope
-from sklearn.decomposition import PCA
-from sklearn.cluster import AgglomerarchicalClustering
-from sklearn.metrics import silhouette_score
-from skrub import Joiner
-import shap
-
-# Causal Inference
-try:
-    from causalml.inference.meta import BaseXRegressor, XRegressor
-    from causalml.inference.tree import CausalForestDML
-    CAUSAL_ML_AVAILABLE = True
-except:
-    CAUSAL_ML_AVAILABLE = False
-    logging.warning("CausalML not available - install with: pip install causalml")
+# Cap BLAS/OpenMP pools before NumPy loads them - only one ML job runs at a time,
+# and every library spawning cpu_count() threads would oversubscribe the cores
+ML_THREADS = max(1, (os.cpu_count() or 2) // 2)
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, str(ML_THREADS))
 
-# Time Series
-from statsmodels.tsa.seasonal import seasonal_decompose
-from statsmodels.tsa.stattools import adfuller, granger_causality_matrix
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
+import numpy as np
+import scipy.fft
 
-# Feature Engineering
+# Numba JIT for the fused feature kernels
 try:
-    from tsfresh import extract_features, extract_relevant_features
-    from tsfresh.utilities.dataframe_functions import impute
-    TSFRESH_AVAILABLE = True
-except:
-    TSFRESH_AVAILABLE = False
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.warning("Numba not available - feature kernels run in pure Python (pip install numba)")
+
+    def njit(*args, **kwargs):
+        """Fallback: run the kernels as plain Python when Numba is missing"""
+        return lambda func: func
+
+# Heavy ML stacks (TensorFlow, scikit-learn, SHAP, statsmodels) are imported where
+# they are first used, so the API is up before they load; only probe for extras here
+CAUSAL_ML_AVAILABLE = importlib.util.find_spec("causalml") is not None
+if not CAUSAL_ML_AVAILABLE:
+    logging.warning("CausalML not available - install with: pip install causalml")
+
+TSFRESH_AVAILABLE = importlib.util.find_spec("tsfresh") is not None
+if not TSFRESH_AVAILABLE:
     logging.warning("tsfresh not available - install with: pip install tsfresh")
 
 # Graph Neural Networks
-try:
-    import networkx as nx
-    from spektral.layers import GraphConv
-    GNN_AVAILABLE = True
-except:
-    GNN_AVAILABLE = False
+import networkx as nx
+GNN_AVAILABLE = importlib.util.find_spec("spektral") is not None
+if not GNN_AVAILABLE:
     logging.warning("Spektral not available - install with: pip install spektral")
 
 from flask import Flask, jsonify, request, send_file
@@ -72,43 +62,280 @@ import paramiko
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+METRICS_HISTORY = 1000  # Samples kept per device
+N_METRICS = 8  # in/out packets, in/out bytes, errors, ports, cpu, memory
+MIN_TRAINING_SAMPLES = 100  # History a device needs before it gets a feature vector
+FEATURE_CACHE_TTL = 30  # Seconds the analysis loop reuses the training loop's feature matrix
+QUANT_CALIBRATION_SAMPLES = 200  # Rows fed to the int8 converter to calibrate activation ranges
+
+# "show arp" row: Internet  <ip>  <age>  <mac>
+_ARP_RE = re.compile(rb'^\S+\s+(\d+\.\d+\.\d+\.\d+)\s+\S+\s+[0-9a-f.:]+', re.MULTILINE)
+
+_rng = np.random.default_rng()
+# Ranges of the integer metrics: in/out packets, in/out bytes, errors, ports
+_COUNTER_LOW = np.array([100, 100, 1000, 1000, 0, 1])
+_COUNTER_HIGH = np.array([10000, 10000, 1000000, 1000000, 10, 5])
+
+
+@njit(cache=True, nogil=True)
+def _column_moments(data):
+    """Per-column mean, variance, skewness, excess kurtosis, min and max of a (T, C) array
+    in one pass (Welford extended to M3/M4); constant columns get skewness = kurtosis = 0"""
+    n_rows, n_cols = data.shape
+    mean = np.zeros(n_cols)
+    m2 = np.zeros(n_cols)
+    m3 = np.zeros(n_cols)
+    m4 = np.zeros(n_cols)
+    lo = np.empty(n_cols)
+    hi = np.empty(n_cols)
+    for c in range(n_cols):
+        lo[c] = data[0, c]
+        hi[c] = data[0, c]
+
+    for t in range(n_rows):
+        n = t + 1.0
+        for c in range(n_cols):
+            x = data[t, c]
+            delta = x - mean[c]
+            delta_n = delta / n
+            delta_n2 = delta_n * delta_n
+            term1 = delta * delta_n * t
+            mean[c] += delta_n
+            # Higher moments first - each update uses the previous lower ones
+            m4[c] += term1 * delta_n2 * (n * n - 3.0 * n + 3.0) + 6.0 * delta_n2 * m2[c] - 4.0 * delta_n * m3[c]
+            m3[c] += term1 * delta_n * (n - 2.0) - 3.0 * delta_n * m2[c]
+            m2[c] += term1
+            if x < lo[c]:
+                lo[c] = x
+            elif x > hi[c]:
+                hi[c] = x
+
+    skew = np.zeros(n_cols)
+    kurt = np.zeros(n_cols)
+    for c in range(n_cols):
+        if m2[c] > 0.0:
+            skew[c] = np.sqrt(n_rows) * m3[c] / m2[c] ** 1.5
+            kurt[c] = n_rows * m4[c] / (m2[c] * m2[c]) - 3.0
+
+    return mean, m2 / n_rows, skew, kurt, lo, hi
+
+
+@njit(cache=True, nogil=True)
+def _spectral_stats(mag, n):
+    """Entropy (bits), centroid, rolloff and bandwidth of an n-point one-sided magnitude spectrum"""
+    n_bins = mag.shape[0]
+    total = 0.0
+    f_sum = 0.0
+    f2_sum = 0.0
+    mlogm = 0.0
+    for k in range(n_bins):
+        m = np.float64(mag[k])
+        f = k / n  # rfftfreq
+        total += m
+        f_sum += f * m
+        f2_sum += f * f * m
+        if m > 0.0:
+            mlogm += m * np.log2(m)
+    
+    if total <= 0.0:  # All-zero (constant) column - flat spectrum, nothing to describe
+        return 0.0, 0.0, 0.0, 0.0
+    
+    # -sum(p log p) with p = m / total, without materializing p
+    entropy = np.log2(total) - mlogm / total
+    centroid = f_sum / total
+    # sum((f - f_mean)^2 m) expanded; f_mean is the mean of the bin frequencies
+    f_mean = (n_bins - 1) / (2.0 * n)
+    bandwidth = np.sqrt(max(f2_sum - 2.0 * f_mean * f_sum + f_mean * f_mean * total, 0.0) / total)
+    
+    rolloff = (n_bins - 1) / n
+    cum = 0.0
+    for k in range(n_bins):
+        cum += mag[k]
+        if cum >= 0.85 * total:
+            rolloff = k / n
+            break
+    
+    return entropy, centroid, rolloff, bandwidth
+
+
+@njit(cache=True, nogil=True)
+def _trend_stats(ts):
+    """Least-squares slope over the sample index and mean/std/min/max of the first difference, in one pass"""
+    n = ts.shape[0]
+    x_mean = (n - 1) / 2.0
+    prev = np.float64(ts[0])
+    sxy = -x_mean * prev
+    d_mean = 0.0
+    d_m2 = 0.0
+    d_lo = np.inf
+    d_hi = -np.inf
+    for t in range(1, n):
+        y = np.float64(ts[t])
+        sxy += (t - x_mean) * y  # sum((x - x_mean) * y) == n * cov(x, y)
+        d = y - prev
+        prev = y
+        delta = d - d_mean
+        d_mean += delta / t
+        d_m2 += delta * (d - d_mean)
+        if d < d_lo:
+            d_lo = d
+        if d > d_hi:
+            d_hi = d
+    
+    # var(x) of 0..n-1 is (n^2 - 1) / 12, so no least-squares solve is needed
+    slope = 12.0 * sxy / (n * (n * n - 1.0))
+    return slope, d_mean, np.sqrt(d_m2 / (n - 1)), d_lo, d_hi
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tf():
+    """Import TensorFlow once, on first use"""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(ML_THREADS)
+    return tf
+
+
+def _to_tflite(model, select_tf_ops: bool = False, representative_data: Optional[np.ndarray] = None):
+    """Freeze a trained Keras model into a TFLite interpreter (None if conversion fails)
+    
+    With representative_data the model is fully int8-quantized (int8 in/out); if that
+    conversion fails it falls back to the default dynamic-range model.
+    """
+    tf = _get_tf()
+    if representative_data is not None:
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            # Calibrate activation ranges on real samples, one row per step
+            samples = representative_data[:QUANT_CALIBRATION_SAMPLES].astype(np.float32)
+            converter.representative_dataset = lambda: ([row[None, :]] for row in samples)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+            interpreter = tf.lite.Interpreter(model_content=converter.convert())
+            interpreter.allocate_tensors()
+            return interpreter
+        except Exception as e:
+            logger.warning(f"int8 quantization failed - using dynamic-range TFLite: {e}")
+    try:
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if select_tf_ops:
+            # Non-fused (relu) LSTMs keep TensorList ops that only run as TF select ops
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+            converter._experimental_lower_tensor_list_ops = False
+        interpreter = tf.lite.Interpreter(model_content=converter.convert())
+        interpreter.allocate_tensors()
+        return interpreter
+    except Exception as e:
+        logger.warning(f"TFLite conversion failed - keeping TensorFlow inference: {e}")
+        return None
+
+
+def _run_tflite(interpreter, X: np.ndarray) -> np.ndarray:
+    """One forward pass of a TFLite interpreter, resizing its input to the batch if needed"""
+    input_details = interpreter.get_input_details()[0]
+    if tuple(input_details["shape"]) != X.shape:
+        interpreter.resize_tensor_input(input_details["index"], X.shape)
+        interpreter.allocate_tensors()
+    if input_details["dtype"] == np.int8:
+        scale, zero_point = input_details["quantization"]
+        X = np.clip(np.round(X / scale) + zero_point, -128, 127).astype(np.int8)
+    interpreter.set_tensor(input_details["index"], X)
+    interpreter.invoke()
+    output_details = interpreter.get_output_details()[0]
+    output = interpreter.get_tensor(output_details["index"])
+    if output_details["dtype"] == np.int8:
+        scale, zero_point = output_details["quantization"]
+        output = (output.astype(np.float32) - zero_point) * scale
+    return output
+
+
+class RingBuffer:
+    """Fixed-capacity (capacity, n_channels) float32 ring buffer with a contiguous window"""
+    
+    def __init__(self, capacity: int, n_channels: int):
+        self.capacity = capacity
+        # Every row is stored twice (slot and slot + capacity), so the newest `size`
+        # rows are always one contiguous slice - no np.roll/concatenate on read
+        self.buf = np.zeros((2 * capacity, n_channels), dtype=np.float32)
+        self.head = 0
+        self.size = 0
+        self._lock = threading.Lock()  # The collector pushes while analysis threads snapshot
+    
+    def push(self, row: np.ndarray):
+        """Append one sample, overwriting the oldest once full"""
+        with self._lock:
+            self.buf[self.head] = row
+            self.buf[self.head + self.capacity] = row
+            self.head = (self.head + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+    
+    def snapshot(self) -> np.ndarray:
+        """Samples oldest to newest as a (size, n_channels) copy - one memcpy of the contiguous window"""
+        with self._lock:
+            end = self.head + self.capacity
+            return self.buf[end - self.size:end].copy()
+    
+    def __len__(self) -> int:
+        return self.size
+
 
 class AdvancedFeatureEngineering:
     """Automatic feature engineering from raw metrics"""
     
     @staticmethod
-    def extract_statistical_features(timeseries: np.ndarray) -> Dict[str, float]:
-        """Extract statistical features"""
-        if len(timeseries) < 2:
+    def extract_statistical_features(data: np.ndarray) -> Dict[str, np.ndarray]:
+        """Extract statistical features for every column of a (T, C) array"""
+        if len(data) < 2:
             return {}
         
+        data = np.ascontiguousarray(data, dtype=np.float64).reshape(len(data), -1)
+        mean, variance, skewness, kurtosis, lo, hi = _column_moments(data)
+        q25, median, q75 = np.percentile(data, [25, 50, 75], axis=0)
+        
         return {
-            "mean": float(np.mean(timeseries)),
-            "std": float(np.std(timeseries)),
-            "variance": float(np.var(timeseries)),
-            "min": float(np.min(timeseries)),
-            "max": float(np.max(timeseries)),
-            "median": float(np.median(timeseries)),
-            "skewness": float(stats.skew(timeseries)),
-            "kurtosis": float(stats.kurtosis(timeseries)),
-            "range": float(np.max(timeseries) - np.min(timeseries)),
-            "iqr": float(np.percentile(timeseries, 75) - np.percentile(timeseries, 25))
+            "mean": mean,
+            "std": np.sqrt(variance),
+            "variance": variance,
+            "min": lo,
+            "max": hi,
+            "median": median,
+            "skewness": skewness,
+            "kurtosis": kurtosis,
+            "range": hi - lo,
+            "iqr": q75 - q25
         }
     
     @staticmethod
-    def extract_spectral_features(timeseries: np.ndarray) -> Dict[str, float]:
-        """Extract spectral features via FFT"""
-        if len(timeseries) < 4:
+    def centered_spectrum(data: np.ndarray, mean=None) -> np.ndarray:
+        """Mean-removed rfft zero-padded to 2T, per column of a (T, C) array - feeds spectral and ACF features"""
+        centered = data - (np.mean(data, axis=0) if mean is None else mean)
+        return scipy.fft.rfft(centered, n=2 * len(data), axis=0, workers=ML_THREADS)
+    
+    @staticmethod
+    def extract_spectral_features(timeseries: np.ndarray, spectrum: np.ndarray = None,
+                                  mean: float = None) -> Dict[str, float]:
+        """Extract spectral features via FFT (one-sided magnitude spectrum)"""
+        n = len(timeseries)
+        if n < 4:
             return {}
         
-        fft = np.abs(np.fft.fft(timeseries))
-        freqs = np.fft.fftfreq(len(timeseries))
+        if mean is None:
+            mean = np.mean(timeseries)
+        if spectrum is None:
+            spectrum = AdvancedFeatureEngineering.centered_spectrum(timeseries, mean)
+        
+        # Even bins of the 2N-padded transform are the N-point rfft; only DC lost the mean
+        fft = np.abs(spectrum[::2])
+        fft[0] = abs(n * mean)
+        entropy, centroid, rolloff, bandwidth = _spectral_stats(fft, n)
         
         return {
-            "spectral_entropy": float(stats.entropy(fft / np.sum(fft))),
-            "spectral_centroid": float(np.sum(freqs * fft) / np.sum(fft)),
-            "spectral_rolloff": float(freqs[np.where(np.cumsum(fft) >= 0.85 * np.sum(fft))[0][0]]),
-            "spectral_bandwidth": float(np.sqrt(np.sum(((freqs - np.mean(freqs))**2) * fft) / np.sum(fft)))
+            "spectral_entropy": float(entropy),
+            "spectral_centroid": float(centroid),
+            "spectral_rolloff": float(rolloff),
+            "spectral_bandwidth": float(bandwidth)
         }
     
     @staticmethod
@@ -122,18 +349,15 @@ class AdvancedFeatureEngineering:
         hist = hist / np.sum(hist)
         shannon_entropy = -np.sum(hist * np.log2(hist + 1e-10))
         
-        # Permutation entropy
-        from itertools import permutations
+        # Permutation entropy (order 3): the ordinal pattern of a window is fixed by its
+        # three pairwise comparisons, so pack them into a 0..7 code and count with bincount
         order = 3
-        patterns = {}
-        for i in range(len(timeseries) - order):
-            pattern = tuple(np.argsort(timeseries[i:i+order]))
-            patterns[pattern] = patterns.get(pattern, 0) + 1
-        
-        pattern_entropy = -np.sum([
-            (count / (len(timeseries) - order)) * np.log2(count / (len(timeseries) - order) + 1e-10)
-            for count in patterns.values()
-        ])
+        n_windows = len(timeseries) - order
+        w = np.lib.stride_tricks.sliding_window_view(timeseries, order)[:n_windows]
+        codes = (w[:, 0] > w[:, 1]) * 4 + (w[:, 0] > w[:, 2]) * 2 + (w[:, 1] > w[:, 2])
+        counts = np.bincount(codes, minlength=8)  # Codes 2 and 5 are impossible and stay 0
+        p = counts[counts > 0] / n_windows
+        pattern_entropy = -np.sum(p * np.log2(p + 1e-10))
         
         return {
             "shannon_entropy": float(shannon_entropy),
@@ -142,14 +366,22 @@ class AdvancedFeatureEngineering:
         }
     
     @staticmethod
-    def extract_autocorrelation_features(timeseries: np.ndarray) -> Dict[str, float]:
-        """Extract autocorrelation features"""
-        if len(timeseries) < 20:
+    def extract_autocorrelation_features(timeseries: np.ndarray, mean: float = None,
+                                         spectrum: np.ndarray = None) -> Dict[str, float]:
+        """Extract autocorrelation features (Wiener-Khinchin: ACF = IFFT of the power spectrum)"""
+        n = len(timeseries)
+        if n < 20:
             return {}
         
-        acf_vals = np.correlate(timeseries - np.mean(timeseries), 
-                               timeseries - np.mean(timeseries), mode='full')
-        acf_vals = acf_vals[len(acf_vals)//2:] / acf_vals[len(acf_vals)//2]
+        if spectrum is None:
+            spectrum = AdvancedFeatureEngineering.centered_spectrum(timeseries, mean)
+        
+        # 2N zero-padding keeps the circular correlation free of wrap-around for lags < N
+        acf_vals = scipy.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=2 * n)[:n]
+        if acf_vals[0] > 0:
+            acf_vals /= acf_vals[0]
+        else:  # Constant column - no variance to correlate, report zeros instead of NaN
+            acf_vals[:] = 0.0
         
         return {
             "acf_1": float(acf_vals[1] if len(acf_vals) > 1 else 0),
@@ -165,21 +397,37 @@ class AdvancedFeatureEngineering:
         if len(timeseries) < 2:
             return {}
         
-        # Linear trend
-        x = np.arange(len(timeseries))
-        z = np.polyfit(x, timeseries, 1)
-        trend_slope = z[0]
-        
-        # Rate of change
-        roc = np.diff(timeseries)
+        # Linear trend (closed form) and rate of change, without np.polyfit or a diff array
+        trend_slope, roc_mean, roc_std, roc_min, roc_max = _trend_stats(np.asarray(timeseries))
         
         return {
             "trend_slope": float(trend_slope),
-            "roc_mean": float(np.mean(roc)),
-            "roc_std": float(np.std(roc)),
-            "roc_max": float(np.max(roc)),
-            "roc_min": float(np.min(roc))
+            "roc_mean": float(roc_mean),
+            "roc_std": float(roc_std),
+            "roc_max": float(roc_max),
+            "roc_min": float(roc_min)
         }
+    
+    @staticmethod
+    def extract_device_features(data: np.ndarray) -> np.ndarray:
+        """Feature vector of one device's (T, C) metrics - one feature block per metric column"""
+        statistical = AdvancedFeatureEngineering.extract_statistical_features(data)
+        # One batched transform for all metric columns
+        spectra = AdvancedFeatureEngineering.centered_spectrum(data, statistical["mean"])
+        
+        columns = []
+        for i in range(data.shape[1]):
+            ts = data[:, i]
+            mean = statistical["mean"][i]
+            spectrum = spectra[:, i]
+            columns.append([
+                *(values[i] for values in statistical.values()),
+                *AdvancedFeatureEngineering.extract_spectral_features(ts, spectrum, mean).values(),
+                *AdvancedFeatureEngineering.extract_entropy_features(ts).values(),
+                *AdvancedFeatureEngineering.extract_autocorrelation_features(ts, mean, spectrum).values(),
+            ])
+        
+        return np.asarray(columns, dtype=np.float32).ravel()
 
 
 class DeepLearningAnomalyDetector:
@@ -189,12 +437,19 @@ class DeepLearningAnomalyDetector:
         self.input_dim = input_dim
         self.latent_dim = latent_dim
         self.model = None
+        self.inference_model = None  # Encoder mean -> decoder, no sampling (shares the VAE's weights)
         self.threshold = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        self._mean = None  # float32 copies of the fitted scaler, for the inline transform
+        self._scale = None
+        self._tflite = None  # Frozen int8 copy of inference_model used for detection
         self.is_trained = False
     
     def build_model(self):
         """Build VAE model"""
+        tf = _get_tf()
+        layers, models = tf.keras.layers, tf.keras.models
+        
         # Encoder
         inputs = layers.Input(shape=(self.input_dim,))
         x = layers.Dense(16, activation='relu')(inputs)
@@ -212,29 +467,52 @@ class DeepLearningAnomalyDetector:
         
         z = layers.Lambda(sampling)([z_mean, z_log_var])
         
-        # Decoder
-        x = layers.Dense(8, activation='relu')(z)
-        x = layers.Dense(16, activation='relu')(x)
-        outputs = layers.Dense(self.input_dim, activation='sigmoid')(x)
+        # Decoder (layers kept so the inference graph can reuse them)
+        decoder = [
+            layers.Dense(8, activation='relu'),
+            layers.Dense(16, activation='relu'),
+            layers.Dense(self.input_dim, activation='sigmoid'),
+        ]
+        
+        def decode(x):
+            for layer in decoder:
+                x = layer(x)
+            return x
         
-        self.model = models.Model(inputs, outputs)
+        self.model = models.Model(inputs, decode(z))
+        # Deterministic reconstruction from z_mean: no RandomStandardNormal op, so it
+        # freezes to a full-int8 TFLite model and gives repeatable errors for the threshold
+        self.inference_model = models.Model(inputs, decode(z_mean))
         
         # Add KL divergence loss
         kl_loss = -0.5 * tf.reduce_mean(tf.reduce_sum(1 + z_log_var - tf.square(z_mean) - tf.exp(z_log_var), axis=1))
         self.model.add_loss(kl_loss)
         
         self.model.compile(optimizer='adam', loss='mse')
+        
+        # Direct graph call for inference - skips predict()'s batching/callback machinery;
+        # the fixed signature means one trace serves every batch size
+        self._infer = tf.function(
+            lambda x: self.inference_model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, self.input_dim), dtype=tf.float32)]
+        )
     
     def train(self, data: np.ndarray, epochs: int = 50, batch_size: int = 32):
         """Train VAE"""
         if self.model is None:
+            self.input_dim = data.shape[1]  # Size the VAE to the feature vector it is trained on
             self.build_model()
         
-        X_scaled = self.scaler.fit_transform(data)
+        from sklearn.preprocessing import StandardScaler
+        self.scaler = StandardScaler().fit(data)
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._scale = self.scaler.scale_.astype(np.float32)
+        X_scaled = self._transform(data)
         self.model.fit(X_scaled, epochs=epochs, batch_size=batch_size, verbose=0)
+        self._tflite = _to_tflite(self.inference_model, representative_data=X_scaled)
         
-        # Calculate reconstruction errors for threshold
-        train_predictions = self.model.predict(X_scaled)
+        # Calculate reconstruction errors for threshold (same inference path as detection)
+        train_predictions = self._reconstruct(X_scaled)
         train_mse = np.mean(np.power(X_scaled - train_predictions, 2), axis=1)
         self.threshold = np.percentile(train_mse, 95)  # 95th percentile
         
@@ -245,9 +523,7 @@ class DeepLearningAnomalyDetector:
         if not self.is_trained:
             return {"is_anomaly": False, "reason": "model_not_trained"}
         
-        X_scaled = self.scaler.transform(data.reshape(1, -1))
-        prediction = self.model.predict(X_scaled, verbose=0)
-        mse = np.mean(np.power(X_scaled - prediction, 2))
+        mse = self.detect_anomalies_batch(data.reshape(1, -1))[0]
         
         is_anomaly = mse > self.threshold
         
@@ -257,6 +533,22 @@ class DeepLearningAnomalyDetector:
             "threshold": float(self.threshold),
             "anomaly_score": float(min(5, (mse / (self.threshold + 1e-10)) * 2))
         }
+    
+    def detect_anomalies_batch(self, X: np.ndarray) -> np.ndarray:
+        """Reconstruction error of every row of X (one row per device) in one forward pass"""
+        X_scaled = self._transform(X)
+        reconstruction = self._reconstruct(X_scaled)
+        return np.mean((X_scaled - reconstruction) ** 2, axis=1)
+    
+    def _reconstruct(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Forward pass - TFLite when the model could be frozen, TensorFlow otherwise"""
+        if self._tflite is not None:
+            return _run_tflite(self._tflite, X_scaled)
+        return self._infer(_get_tf().constant(X_scaled)).numpy()
+    
+    def _transform(self, X: np.ndarray) -> np.ndarray:
+        """StandardScaler.transform inlined on cached float32 vectors (the VAE's own dtype)"""
+        return (X.astype(np.float32, copy=False) - self._mean) / self._scale
 
 
 class LSTMTrafficPredictor:
@@ -266,11 +558,15 @@ class LSTMTrafficPredictor:
         self.sequence_length = sequence_length
         self.forecast_steps = forecast_steps
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        self._tflite = None
         self.is_trained = False
     
     def build_model(self):
         """Build LSTM model"""
+        tf = _get_tf()
+        layers, models = tf.keras.layers, tf.keras.models
+        
         model = models.Sequential([
             layers.LSTM(64, activation='relu', input_shape=(self.sequence_length, 1), return_sequences=True),
             layers.Dropout(0.2),
@@ -282,24 +578,40 @@ class LSTMTrafficPredictor:
         
         model.compile(optimizer='adam', loss='mse')
         self.model = model
+        
+        self._infer = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, self.sequence_length, 1), dtype=tf.float32)]
+        )
     
     def train(self, timeseries: np.ndarray, epochs: int = 50):
         """Train LSTM"""
         if self.model is None:
             self.build_model()
         
+        window = self.sequence_length + self.forecast_steps
+        if len(timeseries) <= window:
+            return
+        
+        from sklearn.preprocessing import StandardScaler
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(timeseries.reshape(-1, 1))
         
-        X, y = [], []
-        for i in range(len(X_scaled) - self.sequence_length - self.forecast_steps):
-            X.append(X_scaled[i:i+self.sequence_length])
-            y.append(X_scaled[i+self.sequence_length:i+self.sequence_length+self.forecast_steps].flatten())
+        # Zero-copy (n_windows, window) view; split into inputs and forecast targets
+        windows = np.lib.stride_tricks.sliding_window_view(X_scaled.ravel(), window)
+        X = windows[:, :self.sequence_length, None].astype(np.float32)
+        y = windows[:, self.sequence_length:].astype(np.float32)
         
-        if len(X) > 0:
-            X = np.array(X)
-            y = np.array(y)
-            self.model.fit(X, y, epochs=epochs, batch_size=16, verbose=0)
-            self.is_trained = True
+        tf = _get_tf()
+        dataset = (
+            tf.data.Dataset.from_tensor_slices((X, y))
+            .shuffle(len(X))
+            .batch(16)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        self.model.fit(dataset, epochs=epochs, verbose=0)
+        self._tflite = _to_tflite(self.model, select_tf_ops=True)
+        self.is_trained = True
     
     def predict(self, timeseries: np.ndarray) -> Dict[str, Any]:
         """Predict and detect anomalies"""
@@ -307,9 +619,12 @@ class LSTMTrafficPredictor:
             return {"can_predict": False}
         
         X_scaled = self.scaler.transform(timeseries[-self.sequence_length:].reshape(-1, 1))
-        X = X_scaled.reshape(1, self.sequence_length, 1)
+        X = X_scaled.reshape(1, self.sequence_length, 1).astype(np.float32)
         
-        forecast = self.model.predict(X, verbose=0)
+        if self._tflite is not None:
+            forecast = _run_tflite(self._tflite, X)
+        else:
+            forecast = self._infer(_get_tf().constant(X)).numpy()
         forecast = self.scaler.inverse_transform(forecast.reshape(-1, 1)).flatten()
         
         # Compare forecast to actual recent values
@@ -332,40 +647,48 @@ class CausalInference:
     def test_granger_causality(X: np.ndarray, Y: np.ndarray, max_lag: int = 5) -> Dict[str, Any]:
         """Test if X causes Y using Granger Causality"""
         try:
-            data = np.column_stack([X, Y])
-            from statsmodels.tsa.stattools import granger_causality_matrix
-            
-            gc_result = granger_causality_matrix(data, max_lag=max_lag, verbose=False)
-            
-            # Extract causality p-values
-            p_values = gc_result[1]  # p-values matrix
+            from statsmodels.tsa.api import VAR
+            results = VAR(np.column_stack([X, Y]).astype(np.float64)).fit(maxlags=max_lag)
+            causes_y = float(results.test_causality(1, 0, kind='f').pvalue)
+            y_causes_x = float(results.test_causality(0, 1, kind='f').pvalue)
             
             return {
-                "causes_y": float(p_values[0, 1, -1]),  # Last lag p-value
-                "y_causes_x": float(p_values[1, 0, -1]),
-                "bidirectional": float(p_values[0, 1, -1]) < 0.05 and float(p_values[1, 0, -1]) < 0.05
+                "causes_y": causes_y,
+                "y_causes_x": y_causes_x,
+                "bidirectional": causes_y < 0.05 and y_causes_x < 0.05
             }
         except Exception as e:
             logger.debug(f"Granger causality error: {e}")
             return {"error": str(e)}
     
     @staticmethod
-    def analyze_causal_paths(device_data: Dict[str, np.ndarray]) -> Dict[str, Any]:
-        """Analyze causal relationships between devices"""
+    def analyze_causal_paths(device_data: Dict[str, np.ndarray], max_lag: int = 5) -> Dict[str, Any]:
+        """Analyze causal relationships between devices with one joint VAR fit"""
         causal_graph = {}
+        if len(device_data) < 2:
+            return causal_graph
         
         devices = list(device_data.keys())
-        for i, dev1 in enumerate(devices):
-            for dev2 in devices[i+1:]:
-                result = CausalInference.test_granger_causality(
-                    device_data[dev1], 
-                    device_data[dev2]
-                )
-                
-                if result.get("causes_y", 1) < 0.05:  # Significant causality
-                    if dev1 not in causal_graph:
-                        causal_graph[dev1] = []
-                    causal_graph[dev1].append((dev2, float(result["causes_y"])))
+        n_samples = min(len(series) for series in device_data.values())
+        data = np.column_stack([device_data[dev][-n_samples:] for dev in devices]).astype(np.float64)
+        
+        try:
+            from statsmodels.tsa.api import VAR
+            # Every pairwise Granger test is a restriction on this single fitted model
+            results = VAR(data).fit(maxlags=max_lag, ic='aic')
+            if results.k_ar == 0:
+                return causal_graph  # AIC picked no lags - nothing can Granger-cause anything
+            
+            for i, dev1 in enumerate(devices):
+                for j, dev2 in enumerate(devices):
+                    if i == j:
+                        continue
+                    p_value = float(results.test_causality(j, i, kind='f').pvalue)
+                    if p_value < 0.05:  # Significant causality: dev1 -> dev2
+                        causal_graph.setdefault(dev1, []).append((dev2, p_value))
+        
+        except Exception as e:
+            logger.debug(f"Causal analysis error: {e}")
         
         return causal_graph
 
@@ -379,13 +702,14 @@ class NetworkGraphAnalysis:
         G = nx.Graph()
         
         n_devices = correlation_matrix.shape[0]
-        for i in range(n_devices):
-            G.add_node(i)
+        G.add_nodes_from(range(n_devices))
         
-        for i in range(n_devices):
-            for j in range(i+1, n_devices):
-                if abs(correlation_matrix[i, j]) > threshold:
-                    G.add_edge(i, j, weight=correlation_matrix[i, j])
+        # Upper triangle in one vectorized comparison, then one bulk insert
+        iu, ju = np.triu_indices(n_devices, k=1)
+        weights = correlation_matrix[iu, ju]
+        mask = np.abs(weights) > threshold
+        # zip of separate lists keeps node ids as ints (a stacked float array would not)
+        G.add_weighted_edges_from(zip(iu[mask].tolist(), ju[mask].tolist(), weights[mask].tolist()))
         
         return G
     
@@ -426,7 +750,10 @@ class RealIntelligentMonitor:
         self.ssh_pass = ssh_pass
         
         # Data storage
-        self.device_metrics = defaultdict(lambda: deque(maxlen=1000))
+        self.device_metrics = defaultdict(lambda: RingBuffer(METRICS_HISTORY, N_METRICS))
+        # (device_ids, X, built_at) shared by the training and analysis threads
+        self._feature_cache: Optional[Tuple[List[str], np.ndarray, float]] = None
+        self._feature_lock = threading.Lock()
         self.active_hosts = {}
         
         # Feature engineering
@@ -436,10 +763,10 @@ class RealIntelligentMonitor:
         self.vae_detector = DeepLearningAnomalyDetector()
         self.lstm_predictor = LSTMTrafficPredictor()
         
-        # Classical ML Ensemble
-        self.isolation_forest = IsolationForest(contamination=0.05)
-        self.elliptic_envelope = EllipticEnvelope(contamination=0.05)
-        self.random_forest = RandomForestClassifier(n_estimators=100)
+        # Classical ML Ensemble (created on first training run)
+        self.isolation_forest = None
+        self.elliptic_envelope = None
+        self.random_forest = None
         
         # Advanced Analysis
         self.causal_inference = CausalInference()
@@ -451,6 +778,8 @@ class RealIntelligentMonitor:
         # State
         self.ssh_client = None
         self.running = False
+        self._stop = threading.Event()
+        self._ml_lock = threading.Lock()  # Training and analysis never run heavy ML concurrently
         self.models_trained = False
         self.anomalies = deque(maxlen=500)
         self.insights = deque(maxlen=200)
@@ -460,6 +789,7 @@ class RealIntelligentMonitor:
     def start(self):
         """Start monitoring"""
         self.running = True
+        self._stop.clear()
         
         # Monitoring threads
         monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
@@ -478,38 +808,41 @@ class RealIntelligentMonitor:
     def stop(self):
         """Stop monitoring"""
         self.running = False
+        self._stop.set()  # Wakes every loop out of its wait immediately
         if self.ssh_client:
             self.ssh_client.close()
     
     def _monitoring_loop(self):
         """Continuous data collection"""
-        while self.running:
+        while not self._stop.is_set():
             try:
                 self._collect_metrics()
-                time.sleep(5)
+                self._stop.wait(5)
             except Exception as e:
                 logger.error(f"Monitoring error: {e}")
-                time.sleep(10)
+                self._stop.wait(10)
     
     def _training_loop(self):
         """Periodic model training"""
-        while self.running:
+        while not self._stop.is_set():
             try:
-                self._train_models()
-                time.sleep(60)  # Train every minute
+                with self._ml_lock:
+                    self._train_models()
+                self._stop.wait(60)  # Train every minute
             except Exception as e:
                 logger.error(f"Training error: {e}")
-                time.sleep(60)
+                self._stop.wait(60)
     
     def _analysis_loop(self):
         """Periodic advanced analysis"""
-        while self.running:
+        while not self._stop.is_set():
             try:
-                self._run_advanced_analysis()
-                time.sleep(30)  # Analyze every 30 seconds
+                with self._ml_lock:
+                    self._run_advanced_analysis()
+                self._stop.wait(30)  # Analyze every 30 seconds
             except Exception as e:
                 logger.error(f"Analysis error: {e}")
-                time.sleep(30)
+                self._stop.wait(30)
     
     def _collect_metrics(self):
         """Collect real network metrics"""
@@ -518,28 +851,20 @@ class RealIntelligentMonitor:
                 self._connect_ssh()
             
             stdin, stdout, stderr = self.ssh_client.exec_command("show arp")
-            output = stdout.read().decode()
             
-            for line in output.split('\n'):
-                if '.' in line and ':' in line:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        ip = parts[1]
-                        self.active_hosts[ip] = True
-                        
-                        # Collect real metrics (in production: from SNMP/Netflow)
-                        metrics = [
-                            np.random.randint(100, 10000),  # in_packets
-                            np.random.randint(100, 10000),  # out_packets
-                            np.random.randint(1000, 1000000),  # in_bytes
-                            np.random.randint(1000, 1000000),  # out_bytes
-                            np.random.randint(0, 10),  # errors
-                            np.random.randint(1, 5),  # ports
-                            np.random.uniform(0, 100),  # cpu
-                            np.random.uniform(0, 100),  # memory
-                        ]
-                        
-                        self.device_metrics[ip].append(metrics)
+            # One regex scan over the raw bytes instead of decoding and splitting every line
+            ips = [match.group(1).decode() for match in _ARP_RE.finditer(stdout.read())]
+            if not ips:
+                return
+            
+            # Collect real metrics (in production: from SNMP/Netflow) - one draw per poll for all hosts
+            metrics = np.empty((len(ips), N_METRICS), dtype=np.float32)
+            metrics[:, :6] = _rng.integers(_COUNTER_LOW, _COUNTER_HIGH, size=(len(ips), 6))  # packets, bytes, errors, ports
+            metrics[:, 6:] = _rng.uniform(0, 100, size=(len(ips), 2))  # cpu, memory
+            
+            for ip, row in zip(ips, metrics):
+                self.active_hosts[ip] = True
+                self.device_metrics[ip].push(row)
             
         except Exception as e:
             logger.error(f"Collection error: {e}")
@@ -547,29 +872,21 @@ class RealIntelligentMonitor:
     def _train_models(self):
         """Train all ML models"""
         try:
-            valid_devices = [ip for ip, data in self.device_metrics.items() if len(data) >= 100]
+            valid_devices, X = self._get_feature_matrix()
             
             if not valid_devices:
                 return
             
-            # Extract features
-            X = []
-            for ip in valid_devices:
-                data = np.array(list(self.device_metrics[ip]))
-                features = {}
+            if X.shape[0] > 10:
+                from sklearn.ensemble import IsolationForest, RandomForestClassifier
+                from sklearn.covariance import EllipticEnvelope
+                import shap
                 
-                for i in range(data.shape[1]):
-                    ts = data[:, i]
-                    features.update(self.feature_extractor.extract_statistical_features(ts))
-                    features.update(self.feature_extractor.extract_spectral_features(ts))
-                    features.update(self.feature_extractor.extract_entropy_features(ts))
-                    features.update(self.feature_extractor.extract_autocorrelation_features(ts))
+                if self.isolation_forest is None:
+                    self.isolation_forest = IsolationForest(contamination=0.05)
+                    self.elliptic_envelope = EllipticEnvelope(contamination=0.05)
+                    self.random_forest = RandomForestClassifier(n_estimators=100)
                 
-                X.append(list(features.values()))
-            
-            X = np.array(X)
-            
-            if X.shape[0] > 10:
                 # Train Deep Learning
                 self.vae_detector.train(X)
                 
@@ -578,15 +895,10 @@ class RealIntelligentMonitor:
                 self.elliptic_envelope.fit(X)
                 
                 # Train LSTM on first device
-                if valid_devices:
-                    first_device_data = np.array(list(self.device_metrics[valid_devices[0]])[:, 0])
-                    self.lstm_predictor.train(first_device_data)
+                self.lstm_predictor.train(self.device_metrics[valid_devices[0]].snapshot()[:, 0])
                 
-                # Train SHAP explainer
-                self.explainer = shap.KernelExplainer(
-                    lambda x: self.isolation_forest.decision_function(x),
-                    X[:min(50, len(X))]
-                )
+                # Train SHAP explainer - exact TreeSHAP on the forest, no sampled model evaluations
+                self.explainer = shap.TreeExplainer(self.isolation_forest)
                 
                 self.models_trained = True
                 logger.info("✓ All models trained successfully")
@@ -600,28 +912,30 @@ class RealIntelligentMonitor:
             if not self.models_trained:
                 return
             
+            self._detect_anomalies()
+            
             # Causal analysis
             valid_devices = list(self.active_hosts.keys())[:5]  # Limit to 5 for computation
+            device_data = {
+                ip: self.device_metrics[ip].snapshot()[:, 0]
+                for ip in valid_devices if len(self.device_metrics[ip]) >= 50
+            }
             
-            if len(valid_devices) >= 2:
-                device_data = {
-                    ip: np.array(list(self.device_metrics[ip]))[:, 0]
-                    for ip in valid_devices if len(self.device_metrics[ip]) >= 50
-                }
+            if len(device_data) >= 2:
+                causal_graph = self.causal_inference.analyze_causal_paths(device_data)
                 
-                if len(device_data) >= 2:
-                    causal_graph = self.causal_inference.analyze_causal_paths(device_data)
-                    
-                    if causal_graph:
-                        self.insights.append({
-                            "timestamp": datetime.now().isoformat(),
-                            "type": "causal_relationship",
-                            "data": causal_graph
-                        })
+                if causal_graph:
+                    self.insights.append({
+                        "timestamp": datetime.now().isoformat(),
+                        "type": "causal_relationship",
+                        "data": causal_graph
+                    })
             
-            # Graph analysis
-            if len(valid_devices) >= 3:
-                correlation_matrix = np.random.rand(len(valid_devices), len(valid_devices))
+            # Graph analysis on the Pearson correlation of the same series
+            if len(device_data) >= 3:
+                n_samples = min(len(series) for series in device_data.values())
+                M = np.stack([series[-n_samples:] for series in device_data.values()])
+                correlation_matrix = np.nan_to_num(np.corrcoef(M))  # Constant series -> NaN -> 0
                 G = self.graph_analysis.build_network_graph(correlation_matrix, threshold=0.7)
                 
                 if G.number_of_edges() > 0:
@@ -638,6 +952,50 @@ class RealIntelligentMonitor:
         except Exception as e:
             logger.debug(f"Analysis error: {e}")
     
+    def _get_feature_matrix(self, max_age: float = None) -> Tuple[List[str], Optional[np.ndarray]]:
+        """Feature matrix (one row per device with enough history), reused while younger than max_age"""
+        with self._feature_lock:
+            if max_age is not None and self._feature_cache and time.time() - self._feature_cache[2] < max_age:
+                return self._feature_cache[0], self._feature_cache[1]
+            
+            # Snapshot the keys - the collection thread may add devices meanwhile
+            valid_devices = [ip for ip, ring in list(self.device_metrics.items()) if len(ring) >= MIN_TRAINING_SAMPLES]
+            
+            # One preallocated float32 matrix, filled row by row
+            X = None
+            for row, ip in enumerate(valid_devices):
+                features = self.feature_extractor.extract_device_features(self.device_metrics[ip].snapshot())
+                if X is None:
+                    X = np.empty((len(valid_devices), features.size), dtype=np.float32)
+                X[row] = features
+            
+            self._feature_cache = (valid_devices, X, time.time())
+            return valid_devices, X
+    
+    def _detect_anomalies(self):
+        """Score all devices with the VAE in one batched forward pass"""
+        if not self.vae_detector.is_trained:
+            return
+        
+        valid_devices, X = self._get_feature_matrix(max_age=FEATURE_CACHE_TTL)
+        if not valid_devices:
+            return
+        
+        errors = self.vae_detector.detect_anomalies_batch(X)
+        threshold = self.vae_detector.threshold
+        
+        timestamp = datetime.now().isoformat()
+        for ip, error in zip(valid_devices, errors):
+            if error > threshold:
+                self.anomalies.append({
+                    "timestamp": timestamp,
+                    "device": ip,
+                    "model": "vae",
+                    "reconstruction_error": float(error),
+                    "threshold": float(threshold),
+                    "anomaly_score": float(min(5, (error / (threshold + 1e-10)) * 2))
+                })
+    
     def _connect_ssh(self):
         """Connect SSH"""
         self.ssh_client = paramiko.SSHClient()
@@ -667,16 +1025,10 @@ class RealIntelligentMonitor:
             return {"error": "Explainer not available"}
         
         try:
-            data = np.array(list(self.device_metrics[device_ip]))[-50:]
-            
-            # Extract features
-            features = []
-            for i in range(data.shape[1]):
-                ts = data[:, i]
-                fs = self.feature_extractor.extract_statistical_features(ts)
-                features.extend(fs.values())
+            data = self.device_metrics[device_ip].snapshot()[-50:]
             
-            features = np.array(features).reshape(1, -1)
+            # Same feature layout the models were trained on
+            features = self.feature_extractor.extract_device_features(data).reshape(1, -1)
             
             # SHAP values
             shap_values = self.explainer.shap_values(features)